@@ -1,6 +1,5 @@
 import streamlit as st
-from PIL import Image
-import io
+from paleta_png import leer_paleta, png_color_solido, zip_paleta
 
 st.set_page_config(page_title="RGB 1cm Square", page_icon="🎨", layout="centered")
 
@@ -42,16 +41,34 @@ st.caption("El cuadrado anterior usa 10 mm CSS para aproximar 1 cm real en tu pa
 # --- (Opcional) Exportar el color como imagen PNG ---
 st.subheader("Descargar color como PNG (opcional)")
 png_size = st.slider("Tamaño PNG (px por lado)", 32, 1024, 256, help="Solo afecta la imagen exportada.")
-img = Image.new("RGB", (png_size, png_size), (r, g, b))
-buf = io.BytesIO()
-img.save(buf, format="PNG")
+png = png_color_solido((r, g, b), png_size)
 st.download_button(
     label="⬇️ Descargar PNG",
-    data=buf.getvalue(),
+    data=png,
     file_name=f"color_{hex_color[1:]}.png",
     mime="image/png"
 )
 
 # --- Vista previa en píxeles (informativa) ---
 st.subheader("Vista previa adicional (imagen raster)")
-st.image(img, caption=f"Vista previa {png_size}×{png_size}px — {hex_color}", use_container_width=False)
+st.image(png, caption=f"Vista previa {png_size}×{png_size}px — {hex_color}", use_container_width=False)
+
+# --- Exportar una paleta completa como ZIP ---
+st.subheader("Exportar paleta (ZIP)")
+texto_paleta = st.text_area("Colores hex (uno por línea o separados por comas)", value=hex_color,
+                            help="Acepta #RRGGBB o RRGGBB; los repetidos se ignoran.")
+paleta = leer_paleta(texto_paleta)
+if paleta:
+    st.markdown(" ".join(
+        f'<span style="display:inline-block;width:18px;height:18px;background:{c};'
+        f'border:1px solid rgba(0,0,0,0.15);margin-right:2px" title="{c}"></span>'
+        for c in paleta
+    ), unsafe_allow_html=True)
+    st.download_button(
+        label=f"⬇️ Descargar {len(paleta)} PNG de {png_size}×{png_size}px (ZIP)",
+        data=zip_paleta(paleta, png_size),
+        file_name="paleta.zip",
+        mime="application/zip",
+    )
+else:
+    st.info("Escribe al menos un color hex para exportar la paleta.")
@@ -0,0 +1,61 @@
+import numpy as np
+
+# Reducción de puntos para graficar series largas al ancho de la figura.
+# Con más de ~2 puntos por píxel la línea dibujada es la misma, pero
+# matplotlib paga por cada punto. Ambos métodos conservan los picos.
+
+
+def minmax(x: np.ndarray, y: np.ndarray, pixeles: int):
+    """
+    Parte la serie en `pixeles` tramos y conserva el mínimo y el máximo de
+    cada uno, en su orden temporal. Devuelve como mucho 2 * pixeles puntos.
+    """
+    n = len(y)
+    if pixeles < 1 or n <= 2 * pixeles:
+        return x, y
+    tamano = -(-n // pixeles)  # techo
+    tramos = -(-n // tamano)
+    # Se rellena el último tramo repitiendo su último valor
+    relleno = np.pad(y, (0, tramos * tamano - n), mode="edge").reshape(tramos, tamano)
+    base = np.arange(tramos)[:, None] * tamano
+    indices = np.sort(np.stack([relleno.argmin(axis=1), relleno.argmax(axis=1)], axis=1), axis=1) + base
+    indices = np.minimum(indices.ravel(), n - 1)
+    # Sin repetir índices (tramos planos o el relleno del final)
+    indices = indices[np.r_[True, indices[1:] != indices[:-1]]]
+    return x[indices], y[indices]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, puntos: int):
+    """
+    Largest-Triangle-Three-Buckets: elige en cada tramo el punto que forma el
+    triángulo más grande con el punto elegido antes y el promedio del tramo
+    siguiente. Devuelve `puntos` puntos (incluye el primero y el último).
+    """
+    n = len(y)
+    if puntos < 3 or n <= puntos:
+        return x, y
+    bordes = np.linspace(1, n - 1, puntos - 1).astype(int)
+    # Promedio de cada tramo interior; el "siguiente" del último es el punto final
+    sumas_x = np.add.reduceat(x[1:n - 1], bordes[:-1] - 1)
+    sumas_y = np.add.reduceat(y[1:n - 1], bordes[:-1] - 1)
+    largos = np.diff(bordes)
+    medias_x = np.append(sumas_x / largos, x[-1])
+    medias_y = np.append(sumas_y / largos, y[-1])
+
+    elegidos = np.empty(puntos, dtype=np.intp)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    a = 0
+    for i in range(puntos - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        tx, ty = x[inicio:fin], y[inicio:fin]
+        # Doble del área del triángulo (a, candidato, media del tramo siguiente)
+        areas = np.abs((x[a] - medias_x[i + 1]) * (ty - y[a]) - (x[a] - tx) * (medias_y[i + 1] - y[a]))
+        a = inicio + int(areas.argmax())
+        elegidos[i + 1] = a
+    return x[elegidos], y[elegidos]
+
+
+METODOS = {
+    "min/max": lambda x, y, pixeles: minmax(x, y, pixeles),
+    "LTTB": lambda x, y, pixeles: lttb(x, y, 2 * pixeles),
+}
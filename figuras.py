@@ -0,0 +1,52 @@
+import io
+import threading
+
+import streamlit as st
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Figuras de matplotlib persistentes por sesión de Streamlit (recta.py, seno.py).
+# Se crean con Figure + FigureCanvasAgg, sin pyplot: pyplot guarda cada figura
+# en un registro global hasta plt.close y con muchas sesiones la memoria crece
+# y aparece "More than 20 figures have been opened". Así la figura vive solo en
+# st.session_state y se libera junto con la sesión. En cada rerun se actualizan
+# las Line2D existentes con set_data y se renderiza a un buffer reutilizado.
+
+
+class FiguraSesion:
+    def __init__(self, figsize, dpi=100):
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot()
+        self.lineas = {}
+        # Un rerun nuevo puede empezar antes de que termine el anterior de la misma sesión
+        self.lock = threading.Lock()
+        self._buffer = io.BytesIO()
+
+    def linea(self, nombre, **estilo):
+        """
+        La Line2D `nombre`, creada vacía con `estilo` la primera vez.
+        """
+        if nombre not in self.lineas:
+            self.lineas[nombre], = self.ax.plot([], [], **estilo)
+        return self.lineas[nombre]
+
+    def ajustar_limites(self):
+        self.ax.relim(visible_only=True)
+        self.ax.autoscale_view()
+
+    def png(self) -> bytes:
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self.canvas.print_png(self._buffer)
+        return self._buffer.getvalue()
+
+
+def figura_sesion(clave: str, construir) -> FiguraSesion:
+    """
+    FiguraSesion guardada en st.session_state[clave]; construir() la crea la
+    primera vez (ejes, textos y líneas fijas).
+    """
+    if clave not in st.session_state:
+        st.session_state[clave] = construir()
+    return st.session_state[clave]
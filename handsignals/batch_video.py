@@ -0,0 +1,236 @@
+# Análisis offline de videos grabados (sin ventana)
+# Divide cada archivo en rangos de frames, procesa cada rango en un proceso
+# distinto con su propio detector y une los resultados en orden de frame.
+#
+# Uso:
+#   python batch_video.py grabaciones/ -o resultados.ndjson
+#   python batch_video.py a.mp4 b.mp4 -o resultados.parquet --workers 8
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+from hand_detector import NO_HAND_RESULT, crear_hands, detect_hands, preprocess_frame, result_from_features
+from landmarks import bounding_boxes_batch, count_extended_fingers_batch, hand_centers_batch, landmarks_to_array
+
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".avi", ".mkv", ".webm")
+
+
+def find_videos(paths):
+    """
+    Expande archivos y directorios a una lista ordenada de videos.
+    """
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in files:
+                    if name.lower().endswith(VIDEO_EXTENSIONS):
+                        videos.append(os.path.join(root, name))
+        else:
+            videos.append(path)
+    return sorted(videos)
+
+
+def split_ranges(path, chunk_frames):
+    """
+    Divide un video en rangos [inicio, fin) de como máximo chunk_frames frames.
+    El último rango queda abierto (fin=None) porque el conteo de frames que
+    reporta OpenCV es aproximado en algunos contenedores.
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        print(f"⚠️ No se pudo abrir {path}", file=sys.stderr)
+        return []
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    if total <= 0:
+        return [(path, 0, None)]
+    ranges = []
+    for start in range(0, total, chunk_frames):
+        end = start + chunk_frames
+        ranges.append((path, start, end if end < total else None))
+    return ranges
+
+
+def process_range(task):
+    """
+    Worker: analiza los frames [inicio, fin) de un video.
+    Cada rango usa su propio detector para que el tracking no se mezcle
+    entre rangos no contiguos.
+    """
+    path, start, end = task
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+    if start:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+    hands = crear_hands(static_image_mode=False)
+    # Por cada frame: (índice, posiciones en el lote de detecciones)
+    frames = []
+    points = []
+    labels = []
+    frame_width = frame_height = 0
+    index = start
+    try:
+        while end is None or index < end:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame, rgb_frame = preprocess_frame(frame)
+            frame_height, frame_width = frame.shape[:2]
+
+            slots = []
+            for hand_landmarks, handedness in detect_hands(hands, rgb_frame):
+                slots.append(len(points))
+                points.append(landmarks_to_array(hand_landmarks))
+                labels.append(handedness.classification[0].label)
+            frames.append((index, slots))
+            index += 1
+    finally:
+        cap.release()
+        hands.close()
+
+    # Características de todo el rango en una sola pasada vectorizada
+    if points:
+        batch = np.stack(points)
+        fingers = count_extended_fingers_batch(batch, np.array(labels) == "Right")
+        boxes = bounding_boxes_batch(batch, frame_width, frame_height)
+        centers = hand_centers_batch(batch, frame_width, frame_height)
+
+    records = []
+    for frame_index, slots in frames:
+        base = {
+            "archivo": path,
+            "frame": frame_index,
+            "tiempo_s": round(frame_index / fps, 4) if fps else None,
+        }
+        if slots:
+            for i in slots:
+                result = result_from_features(fingers[i], boxes[i], centers[i], labels[i])
+                records.append({**base, **result})
+        else:
+            records.append({**base, **NO_HAND_RESULT})
+    return records
+
+
+def flatten_record(record):
+    """
+    Aplana un registro para formatos tabulares (Parquet).
+    """
+    coords = record["coordenadas"] or {}
+    bbox = coords.get("bounding_box") or {}
+    centro = coords.get("centro") or {}
+    return {
+        "archivo": record["archivo"],
+        "frame": record["frame"],
+        "tiempo_s": record["tiempo_s"],
+        "mano_detectada": record["mano_detectada"],
+        "apertura_porcentaje": record["apertura_porcentaje"],
+        "dedos_extendidos": record["dedos_extendidos"],
+        "x_min": bbox.get("x_min"),
+        "y_min": bbox.get("y_min"),
+        "x_max": bbox.get("x_max"),
+        "y_max": bbox.get("y_max"),
+        "centro_x": centro.get("x"),
+        "centro_y": centro.get("y"),
+        "mano": record["mano"],
+    }
+
+
+class NdjsonWriter:
+    def __init__(self, path):
+        self._file = open(path, "w", encoding="utf-8") if path != "-" else sys.stdout
+
+    def write(self, records):
+        self._file.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class ParquetWriter:
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Para escribir Parquet instala pyarrow: pip install pyarrow")
+        self._pa = pa
+        self._pq = pq
+        self._path = path
+        self._writer = None
+
+    def write(self, records):
+        if not records:
+            return
+        table = self._pa.Table.from_pylist([flatten_record(r) for r in records])
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run_batch(paths, output, workers=None, chunk_frames=1500):
+    videos = find_videos(paths)
+    if not videos:
+        print("No se encontraron videos", file=sys.stderr)
+        return
+
+    tasks = [task for video in videos for task in split_ranges(video, chunk_frames)]
+    workers = workers or os.cpu_count() or 1
+    writer = ParquetWriter(output) if output.endswith(".parquet") else NdjsonWriter(output)
+
+    print(f"{len(videos)} video(s), {len(tasks)} rango(s), {workers} proceso(s)", file=sys.stderr)
+    started = time.perf_counter()
+    frames = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Ventana acotada de rangos en vuelo; se escriben en orden de envío,
+            # que es el orden de archivo y de frame.
+            pending = deque()
+            task_iter = iter(tasks)
+            for task in task_iter:
+                pending.append(pool.submit(process_range, task))
+                if len(pending) >= workers * 2:
+                    break
+            while pending:
+                records = pending.popleft().result()
+                writer.write(records)
+                frames += len({r["frame"] for r in records})
+                next_task = next(task_iter, None)
+                if next_task is not None:
+                    pending.append(pool.submit(process_range, next_task))
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ {frames} frames en {elapsed:.1f} s ({frames / elapsed:.1f} frames/s)", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Análisis offline de manos sobre videos grabados")
+    parser.add_argument("entradas", nargs="+", help="Archivos de video o directorios")
+    parser.add_argument("-o", "--salida", default="-",
+                        help="Archivo .ndjson o .parquet (por defecto NDJSON por stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos (por defecto, núcleos disponibles)")
+    parser.add_argument("--frames-por-rango", type=int, default=1500, help="Tamaño de cada rango de frames")
+    args = parser.parse_args(argv)
+
+    run_batch(args.entradas, args.salida, args.workers, args.frames_por_rango)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,57 @@
 # Script para detección de manos y porcentaje de apertura
 # Usando OpenCV y MediaPipe
 
+import argparse
 import cv2
 import mediapipe as mp
-import json
+
+from landmarks import (
+    bounding_boxes_batch,
+    count_extended_fingers_batch,
+    hand_centers_batch,
+    landmarks_to_array,
+)
+from motion_gate import MotionGate
+from preprocess import FramePreprocessor, MirroredHands
+from roi_tracker import RoiTracker
+from metrics import NullMetrics, crear_metrics
+from sinks import StdoutSink, crear_sink
+
+# Salida por defecto: un JSON por línea en stdout
+DEFAULT_SINK = StdoutSink()
+# Instrumentación desactivada por defecto
+NULL_METRICS = NullMetrics()
 
 # Inicializar MediaPipe Hands
 mp_hands = mp.solutions.hands
 mp_draw = mp.solutions.drawing_utils
 
-# Configuración del detector de manos
-hands = mp_hands.Hands(
-    static_image_mode=False,
-    max_num_hands=1,
-    min_detection_confidence=0.7,
-    min_tracking_confidence=0.5
-)
-
-# Índices de los landmarks de las puntas de los dedos
-# Pulgar: 4, Índice: 8, Medio: 12, Anular: 16, Meñique: 20
-FINGER_TIPS = [4, 8, 12, 16, 20]
-# Índices de los nudillos (para comparar si el dedo está extendido)
-FINGER_PIPS = [2, 6, 10, 14, 18]
-
 
-def count_extended_fingers(hand_landmarks, handedness):
+def crear_hands(static_image_mode=False, tracking=False, motion_gate=False, budget_ms=None, mirror=False):
     """
-    Cuenta cuántos dedos están extendidos.
-    Retorna un valor entre 0 y 5.
+    Crea una instancia del detector de manos con la configuración del script.
+    Cada hilo o proceso que haga inferencia debe tener la suya.
+    Con tracking=True se envuelve en un RoiTracker (inferencia sobre un
+    recorte alrededor de la última mano detectada) y con motion_gate=True en
+    un MotionGate (se omite la inferencia si la escena no cambió).
+    Con mirror=True el detector recibe imágenes sin espejar y devuelve los
+    resultados espejados (ver MirroredHands).
     """
-    landmarks = hand_landmarks.landmark
-    fingers_extended = 0
-
-    # Verificar el pulgar (comparación en eje X, depende de la mano)
-    # Para la mano derecha: pulgar extendido si TIP.x < IP.x
-    # Para la mano izquierda: pulgar extendido si TIP.x > IP.x
-    is_right_hand = handedness.classification[0].label == "Right"
-
-    if is_right_hand:
-        # En imagen espejada, mano derecha tiene pulgar a la izquierda
-        if landmarks[4].x < landmarks[3].x:
-            fingers_extended += 1
-    else:
-        # Mano izquierda tiene pulgar a la derecha
-        if landmarks[4].x > landmarks[3].x:
-            fingers_extended += 1
-
-    # Verificar los otros 4 dedos (comparación en eje Y)
-    # Un dedo está extendido si la punta (TIP) está más arriba que el nudillo (PIP)
-    # En la imagen, Y menor = más arriba
-    for tip_idx in [8, 12, 16, 20]:
-        pip_idx = tip_idx - 2  # El PIP está 2 posiciones antes del TIP
-        if landmarks[tip_idx].y < landmarks[pip_idx].y:
-            fingers_extended += 1
-
-    return fingers_extended
+    hands = mp_hands.Hands(
+        static_image_mode=static_image_mode,
+        max_num_hands=1,
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.5
+    )
+    if tracking:
+        hands = RoiTracker(hands)
+    if mirror:
+        # Después del RoiTracker (recorta sobre la imagen sin espejar) y antes
+        # del MotionGate (reutiliza resultados ya espejados)
+        hands = MirroredHands(hands)
+    if motion_gate or budget_ms is not None:
+        hands = MotionGate(hands, budget_ms=budget_ms)
+    return hands
 
 
 def calculate_hand_openness(fingers_extended):
@@ -66,167 +63,277 @@ def calculate_hand_openness(fingers_extended):
     return int((fingers_extended / 5) * 100)
 
 
-def get_hand_bounding_box(hand_landmarks, frame_width, frame_height):
+# Resultado emitido cuando no hay ninguna mano en el frame
+NO_HAND_RESULT = {
+    "mano_detectada": False,
+    "apertura_porcentaje": None,
+    "dedos_extendidos": None,
+    "coordenadas": None,
+    "mano": None
+}
+
+
+def result_from_features(fingers, bbox, center, label):
     """
-    Calcula el bounding box (coordenadas) de la mano detectada.
-    Retorna: (x_min, y_min, x_max, y_max) en píxeles
+    Arma el diccionario de resultado (formato JSON) a partir de las
+    características ya calculadas.
     """
-    x_coords = []
-    y_coords = []
+    x_min, y_min, x_max, y_max = (int(v) for v in bbox)
+    center_x, center_y = (int(v) for v in center)
+    fingers = int(fingers)
+    return {
+        "mano_detectada": True,
+        "apertura_porcentaje": calculate_hand_openness(fingers),
+        "dedos_extendidos": fingers,
+        "coordenadas": {
+            "bounding_box": {
+                "x_min": x_min,
+                "y_min": y_min,
+                "x_max": x_max,
+                "y_max": y_max,
+                "ancho": x_max - x_min,
+                "alto": y_max - y_min
+            },
+            "centro": {
+                "x": center_x,
+                "y": center_y
+            }
+        },
+        "mano": label
+    }
 
-    for landmark in hand_landmarks.landmark:
-        x_coords.append(landmark.x)
-        y_coords.append(landmark.y)
 
-    # Convertir coordenadas normalizadas (0-1) a píxeles
-    x_min = int(min(x_coords) * frame_width)
-    x_max = int(max(x_coords) * frame_width)
-    y_min = int(min(y_coords) * frame_height)
-    y_max = int(max(y_coords) * frame_height)
+def build_result(hand_landmarks, handedness, frame_width, frame_height):
+    """
+    Construye el diccionario de resultado (formato JSON) para una mano detectada.
+    Los landmarks se convierten una sola vez a un arreglo (21, 3).
+    """
+    label = handedness.classification[0].label
+    points = landmarks_to_array(hand_landmarks)
+    fingers = count_extended_fingers_batch(points, label == "Right")[0]
+    bbox = bounding_boxes_batch(points, frame_width, frame_height)[0]
+    center = hand_centers_batch(points, frame_width, frame_height)[0]
+    return result_from_features(fingers, bbox, center, label)
 
-    # Agregar un margen
-    margin = 20
-    x_min = max(0, x_min - margin)
-    y_min = max(0, y_min - margin)
-    x_max = min(frame_width, x_max + margin)
-    y_max = min(frame_height, y_max + margin)
 
-    return x_min, y_min, x_max, y_max
+def open_source(source):
+    """
+    Abre una cámara (índice numérico) o un archivo/URL de video.
+    """
+    return cv2.VideoCapture(int(source) if str(source).isdigit() else source)
 
 
-def get_hand_center(hand_landmarks, frame_width, frame_height):
+def preprocess_frame(frame, metrics=NULL_METRICS):
     """
-    Calcula el centro de la mano (usando el landmark de la muñeca como referencia).
-    Retorna: (center_x, center_y) en píxeles
+    Voltea la imagen horizontalmente (efecto espejo) y la convierte a RGB.
+    Retorna: (frame_espejado_bgr, frame_rgb)
     """
-    # Landmark 0 es la muñeca, landmark 9 es el centro de la palma
-    wrist = hand_landmarks.landmark[0]
-    middle_base = hand_landmarks.landmark[9]
+    with metrics.stage("flip"):
+        frame = cv2.flip(frame, 1)
+    # MediaPipe usa RGB
+    with metrics.stage("cvtcolor"):
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return frame, rgb_frame
 
-    # Calcular el centro como promedio entre muñeca y base del dedo medio
-    center_x = int(((wrist.x + middle_base.x) / 2) * frame_width)
-    center_y = int(((wrist.y + middle_base.y) / 2) * frame_height)
 
-    return center_x, center_y
+def detect_hands(hands, rgb_frame):
+    """
+    Ejecuta MediaPipe sobre un frame RGB.
+    Retorna una lista de (hand_landmarks, handedness); vacía si no hay manos.
+    """
+    results = hands.process(rgb_frame)
+    if results.multi_hand_landmarks and results.multi_handedness:
+        return list(zip(results.multi_hand_landmarks, results.multi_handedness))
+    return []
+
+
+def analyze_frame(hands, rgb_frame, frame_width, frame_height, metrics=NULL_METRICS):
+    """
+    Ejecuta MediaPipe sobre un frame RGB.
+    Retorna una lista de (hand_landmarks, result); vacía si no hay manos.
+    """
+    with metrics.stage("process"):
+        found = detect_hands(hands, rgb_frame)
+    with metrics.stage("features"):
+        return [
+            (hand_landmarks, build_result(hand_landmarks, handedness, frame_width, frame_height))
+            for hand_landmarks, handedness in found
+        ]
 
 
-def main():
+def draw_detection(frame, hand_landmarks, result):
+    """
+    Dibuja landmarks, bounding box, centro y textos de una mano en el frame.
+    """
+    mp_draw.draw_landmarks(
+        frame,
+        hand_landmarks,
+        mp_hands.HAND_CONNECTIONS,
+        mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
+        mp_draw.DrawingSpec(color=(255, 0, 0), thickness=2)
+    )
+
+    bbox = result["coordenadas"]["bounding_box"]
+    centro = result["coordenadas"]["centro"]
+    cv2.rectangle(frame, (bbox["x_min"], bbox["y_min"]), (bbox["x_max"], bbox["y_max"]), (0, 255, 255), 2)
+    cv2.circle(frame, (centro["x"], centro["y"]), 5, (255, 0, 255), -1)
+
+    cv2.putText(frame, f"Mano: SI ({result['mano']})", (10, 30),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+    cv2.putText(frame, f"Apertura: {result['apertura_porcentaje']}%", (10, 60),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+    cv2.putText(frame, f"Dedos: {result['dedos_extendidos']}", (10, 90),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+    cv2.putText(frame, f"Centro: ({centro['x']}, {centro['y']})", (10, 120),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+
+
+def draw_no_hand(frame):
+    cv2.putText(frame, "Mano: NO", (10, 30),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+
+
+def render_detections(frame, detections, sink=None, metrics=NULL_METRICS):
+    """
+    Emite el resultado de cada detección y la dibuja sobre el frame.
+    Sin sink, cada resultado se imprime en JSON por stdout.
+    """
+    sink = sink or DEFAULT_SINK
+    if detections:
+        for hand_landmarks, result in detections:
+            with metrics.stage("output"):
+                sink.write(result)
+            with metrics.stage("draw"):
+                draw_detection(frame, hand_landmarks, result)
+    else:
+        # No se detectó ninguna mano
+        with metrics.stage("output"):
+            sink.write(NO_HAND_RESULT)
+        with metrics.stage("draw"):
+            draw_no_hand(frame)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Detección de manos y porcentaje de apertura")
+    parser.add_argument("--camara", type=int, default=0, help="Índice de la cámara (por defecto 0)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Captura, inferencia y render en hilos separados, descartando frames viejos")
+    parser.add_argument("--tracking", action="store_true",
+                        help="Inferencia sobre un recorte alrededor de la última mano detectada")
+    parser.add_argument("--movimiento", action="store_true",
+                        help="Omitir la inferencia y reutilizar el último resultado si la escena no cambió")
+    parser.add_argument("--presupuesto-ms", type=float, default=None,
+                        help="Costo medio de inferencia por frame permitido (ajusta la tasa de inferencia)")
+    parser.add_argument("--sin-flip", action="store_true",
+                        help="No voltear la imagen antes de la inferencia; se espejan los landmarks")
+    parser.add_argument("--salida", choices=["stdout", "ndjson", "binario"], default="stdout",
+                        help="stdout: un print por resultado; ndjson/binario: escritura con buffer")
+    parser.add_argument("--archivo", default="-",
+                        help="Archivo destino para --salida ndjson/binario (ndjson: por defecto stdout; "
+                             "binario: obligatorio)")
+    parser.add_argument("--solo-cambios", action="store_true",
+                        help="Emitir solo cuando cambian los dedos extendidos o el bounding box")
+    parser.add_argument("--umbral-px", type=int, default=10,
+                        help="Movimiento mínimo del bounding box (px) para --solo-cambios")
+    parser.add_argument("--metricas", action="store_true",
+                        help="Medir la latencia por etapa e imprimir un resumen al salir")
+    parser.add_argument("--metricas-puerto", type=int, default=None,
+                        help="Exponer las métricas (formato Prometheus) en 127.0.0.1:PUERTO/metrics")
+    args = parser.parse_args(argv)
+    # Los registros binarios se mezclarían con los mensajes de texto en stdout
+    if args.salida == "binario" and args.archivo == "-":
+        parser.error("--salida binario requiere --archivo")
+    return args
+
+
+def detector_options(args):
+    return {
+        "tracking": args.tracking,
+        "motion_gate": args.movimiento,
+        "budget_ms": args.presupuesto_ms,
+        "mirror": args.sin_flip,
+    }
+
+
+def print_summary(hands):
+    summary = getattr(hands, "summary", None)
+    text = summary() if summary is not None else ""
+    if text:
+        print("-" * 40)
+        print(text)
+
+
+def finish_metrics(metrics):
+    if metrics.enabled:
+        print("-" * 40)
+        print(metrics.summary())
+    metrics.close()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sink = crear_sink(args.salida, args.archivo, args.solo_cambios, args.umbral_px)
+    metrics = crear_metrics(args.metricas or args.metricas_puerto is not None, args.metricas_puerto)
+
+    if args.pipeline:
+        from pipeline import run_pipeline
+        try:
+            run_pipeline(args.camara, sink=sink, metrics=metrics, **detector_options(args))
+        finally:
+            sink.close()
+            finish_metrics(metrics)
+        return
+
     # Iniciar captura de video
-    cap = cv2.VideoCapture(0)
+    cap = cv2.VideoCapture(args.camara)
 
     if not cap.isOpened():
         print("Error: No se pudo abrir la cámara")
+        sink.close()
+        metrics.close()
         return
 
+    hands = crear_hands(**detector_options(args))
+    # Buffers de captura, espejo y RGB reservados una sola vez
+    preprocessor = FramePreprocessor(flip=not args.sin_flip)
+
     print("Presiona 'q' para salir")
     print("-" * 40)
 
     while True:
-        ret, frame = cap.read()
+        with metrics.stage("capture"):
+            ret, frame = preprocessor.read(cap)
         if not ret:
             print("Error: No se pudo leer el frame")
             break
 
-        # Voltear la imagen horizontalmente para efecto espejo
-        frame = cv2.flip(frame, 1)
-
-        # Convertir BGR a RGB (MediaPipe usa RGB)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-        # Procesar la imagen
-        results = hands.process(rgb_frame)
+        frame, rgb_frame = preprocessor(frame, metrics)
 
         # Obtener dimensiones del frame
         frame_height, frame_width = frame.shape[:2]
 
-        # Verificar si se detectó una mano
-        if results.multi_hand_landmarks and results.multi_handedness:
-            for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
-                # Dibujar los landmarks en la imagen
-                mp_draw.draw_landmarks(
-                    frame,
-                    hand_landmarks,
-                    mp_hands.HAND_CONNECTIONS,
-                    mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                    mp_draw.DrawingSpec(color=(255, 0, 0), thickness=2)
-                )
-
-                # Contar dedos extendidos
-                fingers = count_extended_fingers(hand_landmarks, handedness)
-
-                # Calcular porcentaje de apertura
-                openness = calculate_hand_openness(fingers)
-
-                # Obtener coordenadas de la mano
-                x_min, y_min, x_max, y_max = get_hand_bounding_box(
-                    hand_landmarks, frame_width, frame_height
-                )
-                center_x, center_y = get_hand_center(
-                    hand_landmarks, frame_width, frame_height
-                )
-
-                # Dibujar bounding box en la imagen
-                cv2.rectangle(frame, (x_min, y_min), (x_max, y_max), (0, 255, 255), 2)
-                cv2.circle(frame, (center_x, center_y), 5, (255, 0, 255), -1)
-
-                # Crear resultado en formato JSON
-                result = {
-                    "mano_detectada": True,
-                    "apertura_porcentaje": openness,
-                    "dedos_extendidos": fingers,
-                    "coordenadas": {
-                        "bounding_box": {
-                            "x_min": x_min,
-                            "y_min": y_min,
-                            "x_max": x_max,
-                            "y_max": y_max,
-                            "ancho": x_max - x_min,
-                            "alto": y_max - y_min
-                        },
-                        "centro": {
-                            "x": center_x,
-                            "y": center_y
-                        }
-                    },
-                    "mano": handedness.classification[0].label
-                }
-
-                # Imprimir resultado en JSON
-                print(json.dumps(result, ensure_ascii=False))
-
-                # Mostrar información en la imagen
-                cv2.putText(frame, f"Mano: SI ({handedness.classification[0].label})", (10, 30),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                cv2.putText(frame, f"Apertura: {openness}%", (10, 60),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                cv2.putText(frame, f"Dedos: {fingers}", (10, 90),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                cv2.putText(frame, f"Centro: ({center_x}, {center_y})", (10, 120),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-        else:
-            # No se detectó ninguna mano
-            result = {
-                "mano_detectada": False,
-                "apertura_porcentaje": None,
-                "dedos_extendidos": None,
-                "coordenadas": None,
-                "mano": None
-            }
-            print(json.dumps(result, ensure_ascii=False))
-            cv2.putText(frame, "Mano: NO", (10, 30),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+        # Procesar la imagen
+        detections = analyze_frame(hands, rgb_frame, frame_width, frame_height, metrics)
+        frame = preprocessor.display_frame(frame)
+        render_detections(frame, detections, sink, metrics)
 
         # Mostrar la imagen
-        cv2.imshow("Detector de Manos", frame)
+        with metrics.stage("imshow"):
+            cv2.imshow("Detector de Manos", frame)
+            key = cv2.waitKey(1)
+        metrics.frame_done()
 
         # Salir con 'q'
-        if cv2.waitKey(1) & 0xFF == ord('q'):
+        if key & 0xFF == ord('q'):
             break
 
     # Liberar recursos
     cap.release()
     cv2.destroyAllWindows()
     hands.close()
+    sink.close()
+    print_summary(hands)
+    finish_metrics(metrics)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+# Representación compacta de landmarks con NumPy
+# Cada detección se convierte una sola vez a un arreglo (21, 3) float32 con
+# las coordenadas normalizadas (x, y, z). Varias manos o frames se apilan en
+# (N, 21, 3) y las características se calculan de forma vectorizada.
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+# Índices de MediaPipe Hands: muñeca 0; puntas de los dedos 4, 8, 12, 16, 20
+WRIST = 0
+THUMB_IP = 3
+THUMB_TIP = 4
+MIDDLE_MCP = 9
+OTHER_TIPS = np.array([8, 12, 16, 20])
+OTHER_PIPS = OTHER_TIPS - 2
+
+
+def landmarks_to_array(hand_landmarks, out=None):
+    """
+    Convierte un NormalizedLandmarkList de MediaPipe a un arreglo (21, 3) float32.
+    Si se pasa out, se escribe ahí (por ejemplo una fila de un arreglo (N, 21, 3)).
+    """
+    if out is None:
+        out = np.empty((NUM_LANDMARKS, 3), dtype=np.float32)
+    for i, lm in enumerate(hand_landmarks.landmark):
+        out[i, 0] = lm.x
+        out[i, 1] = lm.y
+        out[i, 2] = lm.z
+    return out
+
+
+def _as_batch(points):
+    points = np.asarray(points)
+    return points.reshape(-1, NUM_LANDMARKS, points.shape[-1])
+
+
+def _per_hand(values, n):
+    # Escalar o arreglo (N,) -> columna (N, 1) para hacer broadcast
+    return np.broadcast_to(np.asarray(values, dtype=np.float64), (n,)).reshape(n, 1)
+
+
+def count_extended_fingers_batch(points, is_right):
+    """
+    Cuenta dedos extendidos para cada mano del lote.
+    points: (21, 3) o (N, 21, 3); is_right: bool o (N,) bool.
+    Retorna: (N,) int con valores entre 0 y 5.
+    """
+    points = _as_batch(points)
+    n = points.shape[0]
+    is_right = np.broadcast_to(np.asarray(is_right, dtype=bool), (n,))
+
+    # Pulgar: en imagen espejada la mano derecha lo tiene a la izquierda
+    thumb_tip_x = points[:, THUMB_TIP, 0]
+    thumb_ip_x = points[:, THUMB_IP, 0]
+    thumb = np.where(is_right, thumb_tip_x < thumb_ip_x, thumb_tip_x > thumb_ip_x)
+
+    # Otros 4 dedos: la punta más arriba (Y menor) que el PIP
+    others = points[:, OTHER_TIPS, 1] < points[:, OTHER_PIPS, 1]
+
+    return thumb.astype(np.int64) + others.sum(axis=1)
+
+
+def bounding_boxes_batch(points, frame_width, frame_height, margin=20):
+    """
+    Bounding box en píxeles de cada mano del lote.
+    frame_width/frame_height pueden ser escalares o arreglos (N,).
+    Retorna: (N, 4) int con columnas x_min, y_min, x_max, y_max.
+    """
+    points = _as_batch(points)
+    n = points.shape[0]
+    width = _per_hand(frame_width, n)
+    height = _per_hand(frame_height, n)
+
+    # float64: MediaPipe entrega double, así el truncamiento a píxeles es el mismo
+    xy = points[:, :, :2].astype(np.float64)
+    mins = xy.min(axis=1)
+    maxs = xy.max(axis=1)
+    scale = np.hstack([width, height])
+
+    boxes = np.empty((n, 4), dtype=np.int64)
+    boxes[:, :2] = np.maximum(0, (mins * scale).astype(np.int64) - margin)
+    boxes[:, 2:] = np.minimum(scale.astype(np.int64), (maxs * scale).astype(np.int64) + margin)
+    return boxes
+
+
+def hand_centers_batch(points, frame_width, frame_height):
+    """
+    Centro de cada mano (promedio entre muñeca y base del dedo medio) en píxeles.
+    Retorna: (N, 2) int con columnas center_x, center_y.
+    """
+    points = _as_batch(points)
+    n = points.shape[0]
+    scale = np.hstack([_per_hand(frame_width, n), _per_hand(frame_height, n)])
+
+    xy = points[:, :, :2].astype(np.float64)
+    center = (xy[:, WRIST] + xy[:, MIDDLE_MCP]) / 2
+    return (center * scale).astype(np.int64)
@@ -0,0 +1,172 @@
+# Instrumentación por etapa del detector de manos
+# Registra la latencia de cada etapa (captura, flip, cvtColor, process, ...),
+# los FPS y los frames descartados. Se puede consultar en formato de texto
+# de Prometheus por HTTP en localhost y se imprime un resumen al salir.
+# Desactivada (NullMetrics) cada etapa cuesta solo un `with` vacío.
+
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+_NULL_CONTEXT = nullcontext()
+
+
+class NullMetrics:
+    enabled = False
+
+    def stage(self, name):
+        return _NULL_CONTEXT
+
+    def frame_done(self):
+        pass
+
+    def summary(self):
+        return ""
+
+    def close(self):
+        pass
+
+
+class _Stage:
+    def __init__(self, metrics, name):
+        self._metrics = metrics
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self._metrics.record(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class StageMetrics:
+    """
+    Guarda las últimas `window` muestras de cada etapa para calcular los
+    cuantiles, además del total acumulado (suma y conteo).
+    """
+
+    enabled = True
+
+    def __init__(self, window=2048):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._sums = {}
+        self._counts = {}
+        self._frame_times = deque(maxlen=120)
+        self.frames = 0
+        # Función que retorna los frames descartados (la fija quien los descarta)
+        self.dropped_source = lambda: 0
+        self._server = None
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def record(self, name, seconds):
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+                self._sums[name] = 0.0
+                self._counts[name] = 0
+            samples.append(seconds)
+            self._sums[name] += seconds
+            self._counts[name] += 1
+
+    def frame_done(self):
+        with self._lock:
+            self.frames += 1
+            self._frame_times.append(time.perf_counter())
+
+    def fps(self):
+        with self._lock:
+            times = list(self._frame_times)
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def snapshot(self):
+        """
+        Retorna {etapa: (cuantiles, suma, conteo)} con los cuantiles en segundos.
+        """
+        with self._lock:
+            data = {name: (sorted(s), self._sums[name], self._counts[name])
+                    for name, s in self._samples.items()}
+        result = {}
+        for name, (ordered, total, count) in data.items():
+            quantiles = {q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in QUANTILES}
+            result[name] = (quantiles, total, count)
+        return result
+
+    def prometheus_text(self):
+        lines = [
+            "# HELP hand_detector_stage_seconds Latencia por etapa del detector de manos",
+            "# TYPE hand_detector_stage_seconds summary",
+        ]
+        for name, (quantiles, total, count) in self.snapshot().items():
+            for q, value in quantiles.items():
+                lines.append(f'hand_detector_stage_seconds{{stage="{name}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'hand_detector_stage_seconds_sum{{stage="{name}"}} {total:.6f}')
+            lines.append(f'hand_detector_stage_seconds_count{{stage="{name}"}} {count}')
+        lines += [
+            "# TYPE hand_detector_fps gauge",
+            f"hand_detector_fps {self.fps():.2f}",
+            "# TYPE hand_detector_frames_total counter",
+            f"hand_detector_frames_total {self.frames}",
+            "# TYPE hand_detector_dropped_frames_total counter",
+            f"hand_detector_dropped_frames_total {self.dropped_source()}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        lines = [f"{'Etapa':<12}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'n':>8}"]
+        for name, (quantiles, _, count) in self.snapshot().items():
+            p50, p95, p99 = (quantiles[q] * 1000 for q in QUANTILES)
+            lines.append(f"{name:<12}{p50:>9.2f}{p95:>9.2f}{p99:>9.2f}{count:>8}")
+        lines.append(f"FPS: {self.fps():.1f}, frames: {self.frames}, descartados: {self.dropped_source()}")
+        return "\n".join(lines)
+
+    def serve(self, port):
+        """
+        Expone /metrics en 127.0.0.1:port desde un hilo en segundo plano.
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metricas", daemon=True).start()
+        return self._server.server_address[1]
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+def crear_metrics(enabled=False, port=None):
+    if not enabled:
+        return NullMetrics()
+    metrics = StageMetrics()
+    if port:
+        bound = metrics.serve(port)
+        print(f"Métricas en http://127.0.0.1:{bound}/metrics")
+    return metrics
@@ -0,0 +1,93 @@
+# Planificador de inferencia por movimiento
+# Antes de llamar a MediaPipe se compara una copia diminuta en escala de
+# grises con la del último frame inferido. Si no hubo movimiento se reutiliza
+# el último resultado. Además, la tasa de inferencia se ajusta para que el
+# costo medio por frame respete un presupuesto de latencia.
+
+import math
+import time
+
+import cv2
+
+
+class MotionGate:
+    """
+    Envuelve un detector (mp_hands.Hands o RoiTracker) con la misma interfaz process()/close().
+    """
+
+    def __init__(self, hands, threshold=2.0, size=(64, 48), max_skip=30, budget_ms=None):
+        self.hands = hands
+        # Diferencia media absoluta (0-255) a partir de la cual hay movimiento
+        self.threshold = threshold
+        self.size = size
+        # Se fuerza una inferencia al menos cada max_skip frames
+        self.max_skip = max_skip
+        # Presupuesto de costo medio de inferencia por frame, en ms (None = sin límite)
+        self.budget_ms = budget_ms
+        # Con presupuesto, solo se infiere cada `stride` frames aunque haya movimiento
+        self.stride = 1
+
+        self._reference = None
+        self._last_results = None
+        self._since_inference = 0
+        self._cost_ms = None
+
+        self.inferred = 0
+        self.skipped_static = 0
+        self.skipped_budget = 0
+
+    def _thumbnail(self, rgb_frame):
+        small = cv2.resize(rgb_frame, self.size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+
+    def _adapt_stride(self):
+        # Costo amortizado por frame = costo de una inferencia / stride
+        if self.budget_ms is None or self._cost_ms is None:
+            return
+        needed = max(1, math.ceil(self._cost_ms / self.budget_ms))
+        if needed > self.stride:
+            self.stride = needed
+        elif self.stride > 1 and self._cost_ms / (self.stride - 1) <= self.budget_ms * 0.8:
+            # Hay holgura suficiente: subir la tasa de a un paso
+            self.stride -= 1
+
+    def process(self, rgb_frame):
+        thumb = self._thumbnail(rgb_frame)
+
+        if self._last_results is not None and self._since_inference + 1 < self.max_skip:
+            moved = cv2.norm(thumb, self._reference, cv2.NORM_L1) / thumb.size >= self.threshold
+            if not moved:
+                self._since_inference += 1
+                self.skipped_static += 1
+                return self._last_results
+            if self._since_inference + 1 < self.stride:
+                self._since_inference += 1
+                self.skipped_budget += 1
+                return self._last_results
+
+        started = time.perf_counter()
+        results = self.hands.process(rgb_frame)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._cost_ms = elapsed_ms if self._cost_ms is None else 0.9 * self._cost_ms + 0.1 * elapsed_ms
+        self._adapt_stride()
+
+        self._reference = thumb
+        self._last_results = results
+        self._since_inference = 0
+        self.inferred += 1
+        return results
+
+    def summary(self):
+        total = self.inferred + self.skipped_static + self.skipped_budget
+        lines = [
+            f"Frames inferidos: {self.inferred}/{total}, "
+            f"omitidos sin movimiento: {self.skipped_static}, "
+            f"omitidos por presupuesto: {self.skipped_budget} (paso actual {self.stride})"
+        ]
+        inner = getattr(self.hands, "summary", None)
+        if inner is not None:
+            lines.append(inner())
+        return "\n".join(lines)
+
+    def close(self):
+        self.hands.close()
@@ -0,0 +1,143 @@
+# Procesamiento de varias cámaras en paralelo
+# Cada fuente (índice de cámara, archivo o URL) corre en su propio proceso con
+# su propio detector, fijado a un núcleo de CPU cuando el sistema lo permite.
+# Los resultados llegan a una sola cola y se emiten etiquetados por fuente
+# como "<posición>:<fuente>", así que repetir una fuente no mezcla workers.
+#
+# Uso:
+#   python multicam.py 0 1 rtsp://camara3/stream
+#   python multicam.py grabacion_a.mp4 grabacion_b.mp4 --salida ndjson --archivo todo.ndjson
+
+import argparse
+import multiprocessing
+import os
+import queue
+import time
+
+from hand_detector import NO_HAND_RESULT, analyze_frame, crear_hands, open_source
+from preprocess import FramePreprocessor
+from sinks import crear_sink
+
+# Marca que envía cada worker al terminar
+_DONE = "__fin__"
+
+
+def assign_cpus(count):
+    """
+    Reparte los núcleos disponibles entre `count` workers (uno por worker,
+    en ronda). Retorna una lista de conjuntos, o Nones si no hay soporte.
+    """
+    if not hasattr(os, "sched_getaffinity"):
+        return [None] * count
+    cpus = sorted(os.sched_getaffinity(0))
+    return [{cpus[i % len(cpus)]} for i in range(count)]
+
+
+def source_worker(source_id, source, results, stop, cpus, detector_options):
+    if cpus is not None:
+        os.sched_setaffinity(0, cpus)
+
+    cap = open_source(source)
+    if not cap.isOpened():
+        results.put((source_id, None, None, {"error": f"No se pudo abrir la fuente {source}"}))
+        results.put((source_id, None, None, _DONE))
+        return
+
+    hands = crear_hands(**detector_options)
+    preprocessor = FramePreprocessor(flip=not detector_options.get("mirror"))
+    index = 0
+    try:
+        while not stop.is_set():
+            ret, frame = preprocessor.read(cap)
+            if not ret:
+                break
+            frame, rgb_frame = preprocessor(frame)
+            frame_height, frame_width = frame.shape[:2]
+            detections = analyze_frame(hands, rgb_frame, frame_width, frame_height)
+            timestamp = time.time()
+            if detections:
+                for _, result in detections:
+                    results.put((source_id, index, timestamp, result))
+            else:
+                results.put((source_id, index, timestamp, NO_HAND_RESULT))
+            index += 1
+    finally:
+        hands.close()
+        cap.release()
+        results.put((source_id, None, None, _DONE))
+
+
+def run_multicam(sources, sink, detector_options=None, affinity=True, queue_size=256):
+    # spawn: cada worker arranca limpio e inicializa MediaPipe por su cuenta
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue(maxsize=queue_size)
+    stop = ctx.Event()
+    cpus = assign_cpus(len(sources)) if affinity else [None] * len(sources)
+
+    source_ids = [f"{i}:{source}" for i, source in enumerate(sources)]
+    workers = []
+    for i, (source_id, source) in enumerate(zip(source_ids, sources)):
+        worker = ctx.Process(
+            target=source_worker,
+            args=(source_id, source, results, stop, cpus[i], detector_options or {}),
+            name=f"fuente-{i}",
+            daemon=True,
+        )
+        worker.start()
+        workers.append(worker)
+
+    counts = dict.fromkeys(source_ids, 0)
+    active = len(workers)
+    started = time.perf_counter()
+    try:
+        while active:
+            try:
+                source_id, index, timestamp, result = results.get(timeout=0.5)
+            except queue.Empty:
+                if not any(w.is_alive() for w in workers):
+                    break
+                continue
+            if result == _DONE:
+                active -= 1
+                continue
+            if "error" in result:
+                print(f"⚠️ {result['error']}")
+                continue
+            counts[source_id] += 1
+            sink.write({"fuente": source_id, "frame": index, "timestamp": timestamp, **result})
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join(timeout=2.0)
+            if worker.is_alive():
+                worker.terminate()
+
+    elapsed = time.perf_counter() - started
+    for source_id, count in counts.items():
+        print(f"{source_id}: {count} resultados ({count / elapsed:.1f}/s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Detección de manos sobre varias cámaras en paralelo")
+    parser.add_argument("fuentes", nargs="+", help="Índices de cámara, archivos o URLs de video")
+    parser.add_argument("--salida", choices=["stdout", "ndjson"], default="stdout")
+    parser.add_argument("--archivo", default="-", help="Archivo destino para --salida ndjson")
+    parser.add_argument("--tracking", action="store_true")
+    parser.add_argument("--movimiento", action="store_true")
+    parser.add_argument("--sin-flip", action="store_true",
+                        help="No voltear la imagen; se espejan los landmarks")
+    parser.add_argument("--sin-afinidad", action="store_true", help="No fijar cada worker a un núcleo")
+    args = parser.parse_args(argv)
+
+    sink = crear_sink(args.salida, args.archivo)
+    detector_options = {"tracking": args.tracking, "motion_gate": args.movimiento, "mirror": args.sin_flip}
+    try:
+        run_multicam(args.fuentes, sink, detector_options, affinity=not args.sin_afinidad)
+    finally:
+        sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# Modo pipeline del detector de manos
+# Captura, inferencia y render corren en etapas separadas. Entre etapas solo
+# se guarda el último elemento: si una etapa va lenta, los frames viejos se
+# descartan en lugar de encolarse, así la latencia extremo a extremo no crece.
+
+import threading
+import time
+
+import cv2
+
+from hand_detector import NULL_METRICS, analyze_frame, crear_hands, print_summary, render_detections
+from preprocess import FramePreprocessor
+
+
+class LatestFrameBuffer:
+    """
+    Buffer de un solo elemento: put() reemplaza lo que haya y get() espera
+    a que llegue un elemento más nuevo que el último leído.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._seq = 0
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if self._item is not None:
+                # Nadie consumió el anterior: se descarta por viejo
+                self.dropped += 1
+            self._item = item
+            self._seq += 1
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """
+        Retorna (seq, item) o None si el buffer se cerró o venció el timeout.
+        """
+        with self._cond:
+            if self._item is None and not self._closed:
+                self._cond.wait(timeout)
+            if self._item is None:
+                return None
+            item, self._item = self._item, None
+            return self._seq, item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+def capture_loop(cap, frames, stop, metrics=NULL_METRICS):
+    while not stop.is_set():
+        with metrics.stage("capture"):
+            ret, frame = cap.read()
+        if not ret:
+            print("Error: No se pudo leer el frame")
+            break
+        frames.put((time.perf_counter(), frame))
+    stop.set()
+    frames.close()
+
+
+def inference_loop(frames, outputs, stop, detector_options, metrics=NULL_METRICS):
+    # El detector se crea dentro del hilo que lo usa: es su único dueño
+    hands = crear_hands(**detector_options)
+    # Sin reutilizar buffers: el hilo de render conserva el frame anterior
+    preprocessor = FramePreprocessor(flip=not detector_options.get("mirror"), reuse=False)
+    try:
+        while not stop.is_set():
+            entry = frames.get(timeout=0.1)
+            if entry is None:
+                continue
+            _, (captured_at, frame) = entry
+            frame, rgb_frame = preprocessor(frame, metrics)
+            frame_height, frame_width = frame.shape[:2]
+            detections = analyze_frame(hands, rgb_frame, frame_width, frame_height, metrics)
+            frame = preprocessor.display_frame(frame)
+            outputs.put((captured_at, frame, detections))
+    finally:
+        hands.close()
+        outputs.close()
+        print_summary(hands)
+
+
+def run_pipeline(camera_index=0, sink=None, metrics=NULL_METRICS, **detector_options):
+    cap = cv2.VideoCapture(camera_index)
+
+    if not cap.isOpened():
+        print("Error: No se pudo abrir la cámara")
+        return
+
+    frames = LatestFrameBuffer()
+    outputs = LatestFrameBuffer()
+    stop = threading.Event()
+    metrics.dropped_source = lambda: frames.dropped + outputs.dropped
+
+    workers = [
+        threading.Thread(target=capture_loop, args=(cap, frames, stop, metrics), name="captura", daemon=True),
+        threading.Thread(target=inference_loop, args=(frames, outputs, stop, detector_options, metrics), name="inferencia", daemon=True),
+    ]
+    for worker in workers:
+        worker.start()
+
+    print("Presiona 'q' para salir")
+    print("-" * 40)
+
+    # El render queda en el hilo principal (imshow/waitKey lo requieren en varias plataformas)
+    rendered = 0
+    started = time.perf_counter()
+    latency_total = 0.0
+    try:
+        while not stop.is_set():
+            entry = outputs.get(timeout=0.1)
+            if entry is not None:
+                _, (captured_at, frame, detections) = entry
+                render_detections(frame, detections, sink, metrics)
+                with metrics.stage("imshow"):
+                    cv2.imshow("Detector de Manos", frame)
+                metrics.frame_done()
+                rendered += 1
+                latency_total += time.perf_counter() - captured_at
+
+            # Salir con 'q'
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join(timeout=2.0)
+        cap.release()
+        cv2.destroyAllWindows()
+
+    elapsed = time.perf_counter() - started
+    if rendered:
+        print("-" * 40)
+        print(f"Frames mostrados: {rendered} ({rendered / elapsed:.1f} FPS), "
+              f"latencia media: {latency_total / rendered * 1000:.1f} ms")
+        print(f"Frames descartados: captura={frames.dropped}, inferencia={outputs.dropped}")
@@ -0,0 +1,100 @@
+# Preprocesamiento de frames sin asignaciones por frame
+# El frame capturado, el espejado y el RGB se escriben en buffers que se
+# reservan una vez y se reutilizan (argumentos dst= de OpenCV). Opcionalmente
+# se omite el flip de la imagen y se espejan los landmarks en su lugar.
+
+import cv2
+import numpy as np
+
+from metrics import NullMetrics
+
+_NULL_METRICS = NullMetrics()
+
+
+class FramePreprocessor:
+    """
+    flip=False: MediaPipe recibe la imagen sin espejar; el detector debe
+    envolverse en MirroredHands para que los resultados no cambien.
+    reuse=False: cada frame usa buffers nuevos (necesario si otro hilo
+    conserva el frame anterior, como en el modo pipeline).
+    """
+
+    def __init__(self, flip=True, reuse=True):
+        self.flip = flip
+        self.reuse = reuse
+        self._capture = None
+        self._flipped = None
+        self._rgb = None
+
+    def _buffers(self, frame):
+        if not self.reuse or self._rgb is None or self._rgb.shape != frame.shape:
+            self._flipped = np.empty_like(frame)
+            self._rgb = np.empty_like(frame)
+        return self._flipped, self._rgb
+
+    def read(self, cap):
+        """
+        cap.read() escribiendo sobre el buffer de captura anterior.
+        """
+        if self.reuse and self._capture is not None:
+            ret, frame = cap.read(self._capture)
+        else:
+            ret, frame = cap.read()
+        if ret and self.reuse:
+            self._capture = frame
+        return ret, frame
+
+    def __call__(self, frame, metrics=_NULL_METRICS):
+        """
+        Retorna: (frame_bgr, frame_rgb). frame_bgr está espejado solo si flip=True.
+        """
+        flipped, rgb = self._buffers(frame)
+        if self.flip:
+            with metrics.stage("flip"):
+                frame = cv2.flip(frame, 1, dst=flipped)
+        with metrics.stage("cvtcolor"):
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        return frame, rgb
+
+    def display_frame(self, frame):
+        """
+        Frame espejado para dibujar y mostrar. Con flip=False se voltea aquí,
+        después de la inferencia y fuera de su camino crítico.
+        """
+        if self.flip:
+            return frame
+        if self.reuse and self._flipped is not None and self._flipped.shape == frame.shape:
+            return cv2.flip(frame, 1, dst=self._flipped)
+        return cv2.flip(frame, 1)
+
+
+class MirroredHands:
+    """
+    Envuelve un detector que recibe imágenes sin espejar y devuelve los
+    resultados como si la imagen se hubiera volteado: x -> 1 - x y la
+    etiqueta Right/Left intercambiada (MediaPipe asume entrada espejada).
+    Con ambas correcciones la lógica del pulgar de count_extended_fingers_batch
+    da el mismo resultado que con el flip de la imagen.
+    """
+
+    def __init__(self, hands):
+        self.hands = hands
+
+    def process(self, rgb_frame):
+        results = self.hands.process(rgb_frame)
+        if results.multi_hand_landmarks:
+            for hand_landmarks in results.multi_hand_landmarks:
+                for lm in hand_landmarks.landmark:
+                    lm.x = 1.0 - lm.x
+        if results.multi_handedness:
+            for handedness in results.multi_handedness:
+                classification = handedness.classification[0]
+                classification.label = "Left" if classification.label == "Right" else "Right"
+        return results
+
+    def summary(self):
+        inner = getattr(self.hands, "summary", None)
+        return inner() if inner is not None else ""
+
+    def close(self):
+        self.hands.close()
@@ -0,0 +1,87 @@
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from preprocess import FramePreprocessor
+
+# Compara el preprocesamiento original (cap.read() + cv2.flip + cv2.cvtColor,
+# cada uno con un arreglo nuevo por frame) contra FramePreprocessor, sin
+# cámara: una captura sintética copia siempre el mismo frame de ruido.
+# Mide el tiempo por frame y, en una segunda pasada con tracemalloc (que ve
+# los arreglos de NumPy/OpenCV), el pico de MB nuevos asignados por frame.
+#
+# Uso:
+#   python preprocess_benchmark.py
+#   python preprocess_benchmark.py --ancho 1920 --alto 1080 --frames 500
+
+
+class CapturaSintetica:
+    """
+    Imita cv2.VideoCapture.read(): copia el frame fuente en `image` si se
+    pasa uno del mismo tamaño, o en un arreglo nuevo.
+    """
+
+    def __init__(self, ancho, alto):
+        self.fuente = np.random.default_rng(0).integers(0, 256, (alto, ancho, 3), dtype=np.uint8)
+
+    def read(self, image=None):
+        if image is None or image.shape != self.fuente.shape:
+            return True, self.fuente.copy()
+        np.copyto(image, self.fuente)
+        return True, image
+
+
+def original(cap):
+    ret, frame = cap.read()
+    frame = cv2.flip(frame, 1)
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return frame, rgb
+
+
+def medir(paso, frames):
+    # Calentamiento: el primer frame de FramePreprocessor reserva sus buffers
+    paso()
+    inicio = time.perf_counter()
+    for _ in range(frames):
+        paso()
+    ms = (time.perf_counter() - inicio) / frames * 1000
+
+    picos = 0
+    tracemalloc.start()
+    for _ in range(frames):
+        antes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        paso()
+        picos += tracemalloc.get_traced_memory()[1] - antes
+    tracemalloc.stop()
+    return ms, picos / frames / 2**20
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de FramePreprocessor con frames sintéticos")
+    parser.add_argument("--ancho", type=int, default=1280)
+    parser.add_argument("--alto", type=int, default=720)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    cap = CapturaSintetica(args.ancho, args.alto)
+    flip = FramePreprocessor(flip=True)
+    sin_flip = FramePreprocessor(flip=False)
+    casos = [
+        ("original", lambda: original(cap)),
+        ("FramePreprocessor", lambda: flip(flip.read(cap)[1])),
+        ("FramePreprocessor sin flip", lambda: sin_flip(sin_flip.read(cap)[1])),
+    ]
+
+    print(f"{args.frames} frames de {args.ancho}×{args.alto}")
+    print(f"{'caso':<28}{'ms/frame':>10}{'MB/frame':>10}")
+    for nombre, paso in casos:
+        ms, mb = medir(paso, args.frames)
+        print(f"{nombre:<28}{ms:>10.2f}{mb:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# Modo tracking por región de interés (ROI)
+# Mientras se conoce la posición de la mano, MediaPipe corre solo sobre un
+# recorte ampliado alrededor del último bounding box. Si la mano se pierde,
+# se busca en una versión reducida del frame completo. Los landmarks siempre
+# se devuelven normalizados respecto al frame completo, así que el JSON de
+# salida no cambia.
+
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from landmarks import bounding_boxes_batch, landmarks_to_array
+
+
+class RoiTracker:
+    """
+    Envuelve una instancia de mp_hands.Hands con la misma interfaz process()/close().
+    """
+
+    def __init__(self, hands, expand=2.0, search_width=640, min_crop=160):
+        self.hands = hands
+        # Factor de ampliación del recorte respecto al bounding box
+        self.expand = expand
+        # Ancho al que se reduce el frame completo cuando se busca la mano
+        self.search_width = search_width
+        # Lado mínimo del recorte en píxeles
+        self.min_crop = min_crop
+        # Recorte actual (x0, y0, x1, y1) en píxeles, o None si no hay mano
+        self.crop = None
+        self.roi_frames = 0
+        self.search_frames = 0
+
+    def _crop_for(self, box, frame_width, frame_height):
+        x_min, y_min, x_max, y_max = box
+        cx = (x_min + x_max) / 2
+        cy = (y_min + y_max) / 2
+        side = max(x_max - x_min, y_max - y_min) * self.expand
+        side = int(min(max(side, self.min_crop), frame_width, frame_height))
+        x0 = int(min(max(cx - side / 2, 0), frame_width - side))
+        y0 = int(min(max(cy - side / 2, 0), frame_height - side))
+        return x0, y0, x0 + side, y0 + side
+
+    def _inside(self, box, crop):
+        # La mano sigue dentro del recorte con al menos un 10 % de holgura
+        x0, y0, x1, y1 = crop
+        pad_x = (x1 - x0) * 0.1
+        pad_y = (y1 - y0) * 0.1
+        return (box[0] >= x0 + pad_x and box[1] >= y0 + pad_y
+                and box[2] <= x1 - pad_x and box[3] <= y1 - pad_y)
+
+    def _search(self, rgb_frame):
+        frame_height, frame_width = rgb_frame.shape[:2]
+        self.search_frames += 1
+        if frame_width > self.search_width:
+            scale = self.search_width / frame_width
+            small = cv2.resize(rgb_frame, (self.search_width, int(frame_height * scale)),
+                               interpolation=cv2.INTER_AREA)
+            # Escalado uniforme: las coordenadas normalizadas no cambian
+            return self.hands.process(small)
+        return self.hands.process(rgb_frame)
+
+    def _process_roi(self, rgb_frame):
+        frame_height, frame_width = rgb_frame.shape[:2]
+        x0, y0, x1, y1 = self.crop
+        self.roi_frames += 1
+        results = self.hands.process(np.ascontiguousarray(rgb_frame[y0:y1, x0:x1]))
+        if not results.multi_hand_landmarks:
+            return results
+
+        # Llevar los landmarks del recorte al frame completo
+        crop_width = x1 - x0
+        crop_height = y1 - y0
+        for hand_landmarks in results.multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = (lm.x * crop_width + x0) / frame_width
+                lm.y = (lm.y * crop_height + y0) / frame_height
+                # z usa la misma escala que x
+                lm.z = lm.z * crop_width / frame_width
+        return results
+
+    def process(self, rgb_frame):
+        frame_height, frame_width = rgb_frame.shape[:2]
+
+        results = None
+        if self.crop is not None:
+            results = self._process_roi(rgb_frame)
+            if not results.multi_hand_landmarks:
+                # Mano perdida en el recorte: buscar en el frame completo
+                self.crop = None
+                results = None
+        if results is None:
+            results = self._search(rgb_frame)
+
+        if not (results.multi_hand_landmarks and results.multi_handedness):
+            self.crop = None
+            return SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+
+        # Caja que envuelve todas las manos detectadas
+        points = np.stack([landmarks_to_array(h) for h in results.multi_hand_landmarks])
+        boxes = bounding_boxes_batch(points, frame_width, frame_height, margin=0)
+        box = (boxes[:, 0].min(), boxes[:, 1].min(), boxes[:, 2].max(), boxes[:, 3].max())
+
+        # El recorte se mantiene mientras la mano siga cómoda dentro de él; así
+        # el tracking interno de MediaPipe ve coordenadas estables entre frames.
+        if self.crop is None or not self._inside(box, self.crop):
+            self.crop = self._crop_for(box, frame_width, frame_height)
+
+        return results
+
+    def summary(self):
+        return f"Frames con recorte: {self.roi_frames}, búsquedas en frame completo: {self.search_frames}"
+
+    def close(self):
+        self.hands.close()
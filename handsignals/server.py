@@ -0,0 +1,189 @@
+# Servidor de resultados sin ventana (headless)
+# La detección corre una sola vez y cada resultado se reparte por TCP (una
+# línea JSON por resultado) a todos los clientes conectados. Cada cliente
+# tiene su propia cola acotada: si se atrasa se descartan sus mensajes más
+# viejos, así un cliente lento no frena la inferencia ni a los demás.
+#
+# Uso:
+#   python server.py --puerto 8765
+#   nc 127.0.0.1 8765
+
+import argparse
+import asyncio
+import contextlib
+import json
+import threading
+
+from hand_detector import NO_HAND_RESULT, analyze_frame, crear_hands, open_source
+from preprocess import FramePreprocessor
+from sinks import ChangedOnly
+
+
+class _Subscriber:
+    def __init__(self, writer, queue_size):
+        self.writer = writer
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def offer(self, message):
+        if self.queue.full():
+            # Se descarta el más viejo para dejar lugar al más reciente
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+
+class ResultServer:
+    """
+    Reparte mensajes (bytes) a los suscriptores TCP. publish() puede
+    llamarse desde cualquier hilo.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, queue_size=32):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self._subscribers = set()
+        # Tareas de los clientes: close() las cancela, porque desde Python 3.12.1
+        # wait_closed() espera a que se cierren todas las conexiones
+        self._handlers = set()
+        self._loop = None
+        self._server = None
+        self.published = 0
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def _handle_client(self, reader, writer):
+        subscriber = _Subscriber(writer, self.queue_size)
+        self._subscribers.add(subscriber)
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        peer = writer.get_extra_info("peername")
+        print(f"Cliente conectado: {peer}")
+        try:
+            while True:
+                message = await subscriber.queue.get()
+                writer.write(message)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._subscribers.discard(subscriber)
+            self._handlers.discard(task)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+            print(f"Cliente desconectado: {peer} (mensajes descartados: {subscriber.dropped})")
+
+    def _broadcast(self, message):
+        self.published += 1
+        for subscriber in self._subscribers:
+            subscriber.offer(message)
+
+    def publish(self, message):
+        self._loop.call_soon_threadsafe(self._broadcast, message)
+
+    async def close(self):
+        self._server.close()
+        handlers = list(self._handlers)
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+
+class BroadcastSink:
+    """
+    Salida compatible con sinks.py que publica cada resultado en el servidor.
+    El JSON se serializa una sola vez y se comparte entre todos los clientes.
+    """
+
+    def __init__(self, server):
+        self.server = server
+
+    def write(self, result):
+        self.server.publish((json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8"))
+
+    def close(self):
+        pass
+
+
+def detection_loop(cap, sink, stop, detector_options):
+    hands = crear_hands(**detector_options)
+    # Sin ventana solo hace falta la imagen RGB: buffers reutilizados
+    preprocessor = FramePreprocessor(flip=not detector_options.get("mirror"))
+    try:
+        while not stop.is_set():
+            ret, frame = preprocessor.read(cap)
+            if not ret:
+                print("Fin de la fuente de video")
+                break
+            frame, rgb_frame = preprocessor(frame)
+            frame_height, frame_width = frame.shape[:2]
+            detections = analyze_frame(hands, rgb_frame, frame_width, frame_height)
+            if detections:
+                for _, result in detections:
+                    sink.write(result)
+            else:
+                sink.write(NO_HAND_RESULT)
+    finally:
+        hands.close()
+        cap.release()
+        stop.set()
+
+
+async def serve(args):
+    server = await ResultServer(args.host, args.puerto, args.cola).start()
+    print(f"Publicando resultados en {server.host}:{server.port}")
+
+    cap = open_source(args.fuente)
+    if not cap.isOpened():
+        print("Error: No se pudo abrir la fuente de video")
+        await server.close()
+        return
+
+    sink = BroadcastSink(server)
+    if args.solo_cambios:
+        sink = ChangedOnly(sink, args.umbral_px)
+
+    stop = threading.Event()
+    detector_options = {"tracking": args.tracking, "motion_gate": args.movimiento, "mirror": args.sin_flip}
+    worker = threading.Thread(target=detection_loop, args=(cap, sink, stop, detector_options),
+                              name="deteccion", daemon=True)
+    worker.start()
+    try:
+        while not stop.is_set():
+            await asyncio.sleep(0.2)
+    finally:
+        stop.set()
+        await asyncio.to_thread(worker.join)
+        await server.close()
+        print(f"Resultados publicados: {server.published}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Detector de manos sin ventana que publica resultados por TCP")
+    parser.add_argument("--fuente", default="0", help="Índice de cámara, archivo o URL de video")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--cola", type=int, default=32, help="Mensajes pendientes por cliente antes de descartar")
+    parser.add_argument("--tracking", action="store_true")
+    parser.add_argument("--movimiento", action="store_true")
+    parser.add_argument("--sin-flip", action="store_true",
+                        help="No voltear la imagen; se espejan los landmarks")
+    parser.add_argument("--solo-cambios", action="store_true")
+    parser.add_argument("--umbral-px", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
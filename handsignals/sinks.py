@@ -0,0 +1,182 @@
+# Salidas del detector de manos
+# Todas exponen write(result) y close(). El resultado es el mismo diccionario
+# que se imprime en JSON.
+#
+#   StdoutSink   - un print() por resultado (comportamiento original)
+#   NdjsonSink   - NDJSON con buffer propio y flush periódico
+#   BinarySink   - registros binarios de tamaño fijo (ver RECORD)
+#   ChangedOnly  - envuelve otra salida y solo emite cuando algo cambió
+
+import json
+import struct
+import sys
+import time
+
+# Registro binario little-endian de 29 bytes:
+#   timestamp (float64, epoch), mano_detectada (u8), mano (u8: 0=ninguna,
+#   1=Right, 2=Left), dedos_extendidos (u8, 255=sin dato), apertura (u8,
+#   255=sin dato), x_min, y_min, x_max, y_max, centro_x, centro_y (int16 c/u;
+#   0 si no hay mano)
+RECORD = struct.Struct("<dBBBB6h")
+HAND_CODES = {None: 0, "Right": 1, "Left": 2}
+HAND_NAMES = {code: name for name, code in HAND_CODES.items()}
+
+
+def encode_record(result, timestamp):
+    if not result["mano_detectada"]:
+        return RECORD.pack(timestamp, 0, 0, 255, 255, 0, 0, 0, 0, 0, 0)
+    bbox = result["coordenadas"]["bounding_box"]
+    centro = result["coordenadas"]["centro"]
+    return RECORD.pack(
+        timestamp, 1, HAND_CODES.get(result["mano"], 0),
+        result["dedos_extendidos"], result["apertura_porcentaje"],
+        bbox["x_min"], bbox["y_min"], bbox["x_max"], bbox["y_max"],
+        centro["x"], centro["y"],
+    )
+
+
+def read_records(stream):
+    """
+    Lee un flujo escrito por BinarySink.
+    Genera tuplas (timestamp, result) con result en el formato JSON habitual.
+    """
+    while True:
+        data = stream.read(RECORD.size)
+        if len(data) < RECORD.size:
+            return
+        ts, detected, hand, fingers, openness, x_min, y_min, x_max, y_max, cx, cy = RECORD.unpack(data)
+        if not detected:
+            yield ts, {
+                "mano_detectada": False,
+                "apertura_porcentaje": None,
+                "dedos_extendidos": None,
+                "coordenadas": None,
+                "mano": None
+            }
+            continue
+        yield ts, {
+            "mano_detectada": True,
+            "apertura_porcentaje": openness,
+            "dedos_extendidos": fingers,
+            "coordenadas": {
+                "bounding_box": {
+                    "x_min": x_min,
+                    "y_min": y_min,
+                    "x_max": x_max,
+                    "y_max": y_max,
+                    "ancho": x_max - x_min,
+                    "alto": y_max - y_min
+                },
+                "centro": {"x": cx, "y": cy}
+            },
+            "mano": HAND_NAMES.get(hand)
+        }
+
+
+class StdoutSink:
+    def write(self, result):
+        print(json.dumps(result, ensure_ascii=False))
+
+    def close(self):
+        pass
+
+
+class _BufferedSink:
+    """
+    Acumula los registros en memoria y los vuelca al archivo cada
+    flush_interval segundos (o al cerrar), con una sola escritura.
+    """
+
+    def __init__(self, stream, flush_interval=1.0):
+        self._stream = stream
+        self._chunks = []
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def _append(self, chunk):
+        self._chunks.append(chunk)
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self._chunks:
+            self._stream.write(self._chunks[0][:0].join(self._chunks))
+            self._chunks.clear()
+        self._stream.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        if self._stream not in (sys.stdout, sys.stdout.buffer):
+            self._stream.close()
+
+
+class NdjsonSink(_BufferedSink):
+    def __init__(self, path="-", flush_interval=1.0):
+        stream = sys.stdout if path == "-" else open(path, "a", encoding="utf-8")
+        super().__init__(stream, flush_interval)
+
+    def write(self, result):
+        self._append(json.dumps(result, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+class BinarySink(_BufferedSink):
+    def __init__(self, path="-", flush_interval=1.0):
+        stream = sys.stdout.buffer if path == "-" else open(path, "ab")
+        super().__init__(stream, flush_interval)
+
+    def write(self, result):
+        self._append(encode_record(result, time.time()))
+
+
+class ChangedOnly:
+    """
+    Solo reenvía un resultado si cambió la detección, los dedos extendidos
+    o alguna coordenada del bounding box en más de threshold píxeles.
+    """
+
+    def __init__(self, sink, threshold=10):
+        self.sink = sink
+        self.threshold = threshold
+        self._last = None
+        self.emitted = 0
+        self.suppressed = 0
+
+    def _changed(self, result):
+        last = self._last
+        if last is None or last["mano_detectada"] != result["mano_detectada"]:
+            return True
+        if not result["mano_detectada"]:
+            return False
+        if last["dedos_extendidos"] != result["dedos_extendidos"] or last["mano"] != result["mano"]:
+            return True
+        old = last["coordenadas"]["bounding_box"]
+        new = result["coordenadas"]["bounding_box"]
+        return any(abs(new[k] - old[k]) > self.threshold for k in ("x_min", "y_min", "x_max", "y_max"))
+
+    def write(self, result):
+        if self._changed(result):
+            self._last = result
+            self.emitted += 1
+            self.sink.write(result)
+        else:
+            self.suppressed += 1
+
+    def close(self):
+        self.sink.close()
+
+
+def crear_sink(kind="stdout", path="-", changed_only=False, threshold=10, flush_interval=1.0):
+    """
+    Crea la salida indicada por línea de comandos.
+    kind: "stdout", "ndjson" o "binario".
+    """
+    if kind == "ndjson":
+        sink = NdjsonSink(path, flush_interval)
+    elif kind == "binario":
+        sink = BinarySink(path, flush_interval)
+    else:
+        sink = StdoutSink()
+    if changed_only:
+        sink = ChangedOnly(sink, threshold)
+    return sink
@@ -1,27 +1,133 @@
 import os
 import json
+import argparse
+import tempfile
+from contextlib import contextmanager
+
+import requests
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 
 # Alcance mínimo para leer perfil básico (nombre)
 SCOPES = ["https://www.googleapis.com/auth/userinfo.profile"]
 
-def main():
-    # 1) Inicia el flujo OAuth (abre el navegador y obtiene el token)
-    flow = InstalledAppFlow.from_client_secrets_file(
-        "client_secret.json",
-        scopes=SCOPES
+CLIENT_SECRETS = "client_secret.json"
+# Caché del token: el flujo del navegador solo corre si no hay token o ya no se puede refrescar
+TOKEN_CACHE = "token.json"
+
+
+@contextmanager
+def bloqueo_archivo(ruta):
+    """
+    Bloqueo exclusivo entre procesos sobre `ruta`.lock, para que dos
+    ejecuciones a la vez no refresquen ni abran el navegador dos veces.
+    """
+    with open(ruta + ".lock", "a+") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def guardar_token(creds, ruta=TOKEN_CACHE):
+    # Escritura atómica; mkstemp crea el archivo con permisos 0600
+    fd, temporal = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(ruta)), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(creds.to_json())
+    os.replace(temporal, ruta)
+
+
+def obtener_credenciales(ruta_token=TOKEN_CACHE, secretos=CLIENT_SECRETS, sesion=None, token_uri=None):
+    """
+    Credenciales desde la caché; si vencieron se refrescan sin intervención
+    y solo si no hay caché (o el refresh fue revocado) se abre el navegador.
+    token_uri reemplaza el endpoint de Google (google-auth lo ignora en el
+    archivo), para probar contra un servidor local.
+    """
+    with bloqueo_archivo(ruta_token):
+        creds = None
+        if os.path.exists(ruta_token):
+            try:
+                creds = Credentials.from_authorized_user_file(ruta_token, SCOPES)
+            except (ValueError, json.JSONDecodeError):
+                creds = None  # caché dañada: se vuelve a autorizar
+        if creds and token_uri:
+            # with_token_uri no copia el vencimiento
+            expiry = creds.expiry
+            creds = creds.with_token_uri(token_uri)
+            creds.expiry = expiry
+        if creds and creds.valid:
+            return creds
+        if creds and creds.expired and creds.refresh_token:
+            try:
+                creds.refresh(Request(sesion or requests.Session()))
+                guardar_token(creds, ruta_token)
+                return creds
+            except RefreshError:
+                pass  # refresh revocado o vencido
+
+        # 1) Inicia el flujo OAuth (abre el navegador y obtiene el token)
+        flow = InstalledAppFlow.from_client_secrets_file(secretos, scopes=SCOPES)
+        creds = flow.run_local_server(port=0)  # inicia un servidor local temporal
+        guardar_token(creds, ruta_token)
+        return creds
+
+
+def crear_servicio(creds, endpoint=None):
+    """
+    Servicio oauth2 v2 con el documento de discovery incluido en
+    google-api-python-client (sin pedirlo por red). El servicio guarda una
+    conexión HTTP autorizada: reutilizarlo evita repetir todo el arranque.
+    """
+    return build(
+        "oauth2", "v2",
+        credentials=creds,
+        static_discovery=True,
+        cache_discovery=False,
+        client_options={"api_endpoint": endpoint} if endpoint else None,
     )
-    creds = flow.run_local_server(port=0)  # inicia un servidor local temporal
 
-    # 2) Llama al endpoint de userinfo (OAuth2 v2) para obtener el nombre
-    service = build("oauth2", "v2", credentials=creds)
-    me = service.userinfo().get().execute()  # dict con info del perfil
 
-    # 3) Imprime el nombre del usuario autenticado
-    #    'name' puede ser None si el perfil no lo expone; maneja ambos casos:
+def nombre_de(me):
+    # 'name' puede ser None si el perfil no lo expone; maneja ambos casos:
     nombre = me.get("name") or f"{me.get('given_name','')} {me.get('family_name','')}".strip()
-    print(nombre if nombre else "Nombre no disponible")
+    return nombre if nombre else "Nombre no disponible"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Muestra el nombre del usuario autenticado con Google")
+    parser.add_argument("--secretos", default=CLIENT_SECRETS, help="client_secret.json de la app")
+    parser.add_argument("--token", default=TOKEN_CACHE, help="Archivo de caché del token")
+    parser.add_argument("--repeticiones", type=int, default=1, help="Consultas de perfil con la misma sesión")
+    parser.add_argument("--endpoint", help="URL base de la API (p. ej. un servidor local de pruebas)")
+    parser.add_argument("--token-uri", help="Endpoint de tokens para el refresh (p. ej. un servidor local de pruebas)")
+    args = parser.parse_args(argv)
+
+    creds = obtener_credenciales(args.token, args.secretos, token_uri=args.token_uri)
+
+    # 2) Llama al endpoint de userinfo (OAuth2 v2) para obtener el nombre
+    service = crear_servicio(creds, args.endpoint)
+    for _ in range(args.repeticiones):
+        me = service.userinfo().get().execute()  # dict con info del perfil
+
+        # 3) Imprime el nombre del usuario autenticado
+        print(nombre_de(me))
+
 
 if __name__ == "__main__":
     main()
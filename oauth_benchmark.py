@@ -0,0 +1,117 @@
+import argparse
+import datetime
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Mide el arranque de oauth.py contra un servidor OAuth/userinfo local (stub),
+# sin red ni navegador:
+#  - frío: token en caché vencido -> refresh + servicio + primer perfil
+#  - tibio: token en caché válido -> servicio + primer perfil
+#  - por consulta, reutilizando el servicio vs. creándolo cada vez
+#
+# Uso:
+#   python oauth_benchmark.py
+#   python oauth_benchmark.py --latencia-ms 40 --repeticiones 50
+
+
+class StubOAuth(BaseHTTPRequestHandler):
+    # HTTP/1.1 para que los clientes puedan mantener la conexión abierta
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latencia = 0.0
+    tokens = 0
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, codigo, datos):
+        time.sleep(self.latencia)
+        cuerpo = json.dumps(datos).encode()
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path != "/token":
+            return self._json(404, {"error": "not_found"})
+        StubOAuth.tokens += 1
+        self._json(200, {"access_token": f"token-{StubOAuth.tokens}", "expires_in": 3600, "token_type": "Bearer"})
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/oauth2/v2/userinfo":
+            return self._json(404, {"error": "not_found"})
+        if not self.headers.get("Authorization", "").startswith("Bearer token-"):
+            return self._json(401, {"error": "invalid_token"})
+        self._json(200, {"id": "1", "name": "Usuario de Prueba", "given_name": "Usuario", "family_name": "de Prueba"})
+
+
+def escribir_token(ruta, vencido):
+    expiry = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=-1 if vencido else 1)
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump({
+            "token": "token-0",
+            "refresh_token": "refresh-stub",
+            "client_id": "stub.apps.googleusercontent.com",
+            "client_secret": "stub",
+            "scopes": ["https://www.googleapis.com/auth/userinfo.profile"],
+            "expiry": expiry.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        }, f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de arranque de oauth.py con un servidor local")
+    parser.add_argument("--latencia-ms", type=float, default=0.0, help="Latencia simulada por respuesta del stub")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    StubOAuth.latencia = args.latencia_ms / 1000
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), StubOAuth)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{servidor.server_address[1]}"
+
+    inicio = time.perf_counter()
+    import oauth
+    print(f"import oauth: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "token.json")
+
+        def arranque(vencido):
+            tiempos = []
+            for _ in range(args.repeticiones):
+                escribir_token(ruta, vencido)
+                inicio = time.perf_counter()
+                creds = oauth.obtener_credenciales(ruta, token_uri=f"{base}/token")
+                me = oauth.crear_servicio(creds, base + "/").userinfo().get().execute()
+                tiempos.append(time.perf_counter() - inicio)
+            assert oauth.nombre_de(me) == "Usuario de Prueba"
+            return sorted(tiempos)[len(tiempos) // 2] * 1000
+
+        print(f"frío (token vencido, refresh): {arranque(True):.1f} ms")
+        print(f"tibio (token en caché):        {arranque(False):.1f} ms")
+
+        creds = oauth.obtener_credenciales(ruta, token_uri=f"{base}/token")
+        servicio = oauth.crear_servicio(creds, base + "/")
+        servicio.userinfo().get().execute()
+        inicio = time.perf_counter()
+        for _ in range(args.repeticiones):
+            servicio.userinfo().get().execute()
+        reutilizado = (time.perf_counter() - inicio) / args.repeticiones * 1000
+        inicio = time.perf_counter()
+        for _ in range(args.repeticiones):
+            oauth.crear_servicio(creds, base + "/").userinfo().get().execute()
+        nuevo = (time.perf_counter() - inicio) / args.repeticiones * 1000
+        print(f"por consulta, servicio reutilizado: {reutilizado:.2f} ms; servicio nuevo cada vez: {nuevo:.2f} ms")
+
+    servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
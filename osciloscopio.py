@@ -0,0 +1,79 @@
+import math
+import time
+
+import numpy as np
+
+# Señal seno generada por bloques para el modo en vivo de seno.py.
+# Cada tick genera solo las muestras del tiempo transcurrido desde el anterior,
+# a partir de un acumulador de fase, y las escribe en un buffer circular de
+# tamaño fijo (dur * fs muestras). Cambiar A, f, τ o DC afecta desde el bloque
+# siguiente; la fase es continua, así que un cambio de frecuencia no salta.
+
+
+class Osciloscopio:
+    def __init__(self, fs: float, dur: float):
+        self.fs = fs
+        self.dur = dur
+        self.capacidad = max(2, int(round(fs * dur)))
+        self.buffer = np.zeros(self.capacidad)
+        # Eje de tiempo fijo, relativo a la muestra más nueva: [-dur, 0]
+        self.tiempos = (np.arange(self.capacidad) - (self.capacidad - 1)) / fs
+        self.pos = 0  # próxima posición a escribir (= muestra más vieja)
+        self.fase = 0.0
+        self.muestras = 0  # total generadas desde el inicio
+        self._vista = np.empty(self.capacidad)
+        self._ultimo = None
+        self._resto = 0.0
+
+    def _escribir(self, y: np.ndarray):
+        n = len(y)
+        fin = self.pos + n
+        if fin <= self.capacidad:
+            self.buffer[self.pos:fin] = y
+        else:
+            corte = self.capacidad - self.pos
+            self.buffer[self.pos:] = y[:corte]
+            self.buffer[:n - corte] = y[corte:]
+        self.pos = fin % self.capacidad
+
+    def generar(self, n: int, A: float, f: float, tau: float, dc: float, saltar: int = 0):
+        """
+        Agrega n muestras nuevas (después de avanzar la fase `saltar` muestras
+        sin generarlas).
+        """
+        paso = 2 * math.pi * f / self.fs
+        self.fase = (self.fase + paso * saltar) % (2 * math.pi)
+        self.muestras += saltar
+        if n <= 0:
+            return
+        fases = self.fase + paso * np.arange(n)
+        self._escribir(A * np.sin(fases - 2 * math.pi * f * tau) + dc)
+        self.fase = (self.fase + paso * n) % (2 * math.pi)
+        self.muestras += n
+
+    def avanzar(self, A: float, f: float, tau: float, dc: float, ahora=None) -> int:
+        """
+        Genera las muestras que corresponden al tiempo real transcurrido desde
+        la llamada anterior (la primera llena la ventana). Retorna cuántas.
+        """
+        ahora = time.perf_counter() if ahora is None else ahora
+        if self._ultimo is None:
+            pendientes = self.capacidad
+        else:
+            exacto = (ahora - self._ultimo) * self.fs + self._resto
+            pendientes = int(exacto)
+            self._resto = exacto - pendientes
+        self._ultimo = ahora
+        # Tras una pausa larga (pestaña en segundo plano) basta con la última ventana
+        saltar = max(0, pendientes - self.capacidad)
+        self.generar(pendientes - saltar, A, f, tau, dc, saltar=saltar)
+        return pendientes - saltar
+
+    def ventana(self) -> np.ndarray:
+        """
+        Contenido del buffer en orden temporal (más vieja primero), en un arreglo reutilizado.
+        """
+        corte = self.capacidad - self.pos
+        self._vista[:corte] = self.buffer[self.pos:]
+        self._vista[corte:] = self.buffer[:self.pos]
+        return self._vista
@@ -0,0 +1,95 @@
+import argparse
+import io
+import re
+import struct
+import sys
+import time
+import zipfile
+import zlib
+from functools import lru_cache
+
+# PNG de color sólido sin dibujar píxeles (usado por colores.py).
+# Es un PNG de paleta de 1 bit con un solo color: todos los píxeles valen 0,
+# así que los datos de imagen (IDAT) solo dependen del tamaño y el color va
+# en la paleta (PLTE). El IDAT se comprime una vez por tamaño y cada color
+# nuevo solo arma los chunks: tiempo casi constante y archivos de pocos cientos
+# de bytes aun a 1024×1024.
+#
+# Uso:
+#   python paleta_png.py paleta.txt --lado 256 -o paleta.zip
+#   echo "#FF0000, #00FF00, 0000FF" | python paleta_png.py - -o primarios.zip
+
+_FIRMA = b"\x89PNG\r\n\x1a\n"
+_HEX = re.compile(r"(?<![0-9A-Fa-f])#?([0-9A-Fa-f]{6})(?![0-9A-Fa-f])")
+
+
+def _chunk(tipo: bytes, datos: bytes) -> bytes:
+    return struct.pack(">I", len(datos)) + tipo + datos + struct.pack(">I", zlib.crc32(tipo + datos))
+
+
+@lru_cache(maxsize=64)
+def _idat_liso(lado: int) -> bytes:
+    # Cada fila: byte de filtro 0 + lado bits en 0 (redondeado a bytes)
+    fila = 1 + (lado + 7) // 8
+    return _chunk(b"IDAT", zlib.compress(bytes(fila * lado), 9))
+
+
+@lru_cache(maxsize=1024)
+def png_color_solido(rgb: tuple, lado: int) -> bytes:
+    """
+    PNG de lado×lado píxeles de un solo color rgb (r, g, b).
+    """
+    ihdr = struct.pack(">IIBBBBB", lado, lado, 1, 3, 0, 0, 0)  # 1 bit, paleta
+    return _FIRMA + _chunk(b"IHDR", ihdr) + _chunk(b"PLTE", bytes(rgb)) + _idat_liso(lado) + _chunk(b"IEND", b"")
+
+
+def hex_a_rgb(hex_color: str) -> tuple:
+    h = hex_color.lstrip("#")
+    return int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
+
+
+def leer_paleta(texto: str) -> list:
+    """
+    Colores hex (#RRGGBB o RRGGBB) de un texto libre, en mayúsculas y sin repetir.
+    """
+    return list(dict.fromkeys(f"#{m.upper()}" for m in _HEX.findall(texto)))
+
+
+def zip_paleta(colores, lado: int) -> bytes:
+    """
+    ZIP con un PNG color_RRGGBB.png por color. Los PNG ya están comprimidos,
+    así que se guardan sin volver a comprimir.
+    """
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_STORED) as zf:
+        for hex_color in colores:
+            zf.writestr(f"color_{hex_color.lstrip('#').upper()}.png", png_color_solido(hex_a_rgb(hex_color), lado))
+    return buf.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta una paleta de colores hex como ZIP de PNG")
+    parser.add_argument("entrada", help="Archivo de texto con colores hex ('-' para stdin)")
+    parser.add_argument("--lado", type=int, default=256, help="Tamaño de cada PNG en píxeles")
+    parser.add_argument("-o", "--salida", default="paleta.zip", help="ZIP de salida")
+    args = parser.parse_args(argv)
+
+    if args.entrada == "-":
+        texto = sys.stdin.read()
+    else:
+        with open(args.entrada, encoding="utf-8") as f:
+            texto = f.read()
+    colores = leer_paleta(texto)
+    if not colores:
+        parser.error("no se encontraron colores hex")
+
+    inicio = time.perf_counter()
+    datos = zip_paleta(colores, args.lado)
+    with open(args.salida, "wb") as f:
+        f.write(datos)
+    print(f"✅ {len(colores)} colores de {args.lado}×{args.lado} px en {args.salida} "
+          f"({len(datos) / 1024:.1f} KB, {(time.perf_counter() - inicio) * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
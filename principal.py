@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+
+import streamlit as st
+
+# Una sola app multipágina para app.py, recta.py, seno.py, colores.py, qr.py y
+# qr_wifi.py: un proceso y un intérprete en vez de seis `streamlit run`.
+# st.navigation ejecuta solo el script de la página abierta, así que
+# matplotlib, PIL, qrcode, etc. se importan la primera vez que se abre una
+# página que los usa y luego quedan compartidos por todas las sesiones.
+#
+# Uso:
+#   streamlit run principal.py
+
+PAGINAS = [
+    st.Page("app.py", title="Slider", icon="🎚️", default=True),
+    st.Page("recta.py", title="Línea recta", icon="📐"),
+    st.Page("seno.py", title="Seno interactivo", icon="📈"),
+    st.Page("colores.py", title="Colores RGB", icon="🎨"),
+    st.Page("qr.py", title="Generador de QR", icon="🔳"),
+    st.Page("qr_wifi.py", title="QR Wi-Fi", icon="📶"),
+]
+
+
+def rss_mb() -> float:
+    """
+    Memoria residente actual del proceso en MB (pico si no hay /proc).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico / 2**20 if sys.platform == "darwin" else pico / 1024
+
+
+@st.cache_resource
+def registro_cargas() -> dict:
+    # Compartido por todas las sesiones: primera apertura de cada página en el proceso
+    return {"arranque_mb": rss_mb(), "paginas": {}}
+
+
+registro = registro_cargas()
+pagina = st.navigation(PAGINAS)
+
+primera_vez = pagina.title not in registro["paginas"]
+modulos_antes = len(sys.modules)
+rss_antes = rss_mb()
+inicio = time.perf_counter()
+pagina.run()
+if primera_vez:
+    registro["paginas"][pagina.title] = {
+        "ms": (time.perf_counter() - inicio) * 1000,
+        "mb": rss_mb() - rss_antes,
+        "modulos": len(sys.modules) - modulos_antes,
+    }
+
+with st.sidebar.expander("Memoria y tiempos de carga"):
+    st.caption(f"Proceso: {rss_mb():.0f} MB · al arrancar: {registro['arranque_mb']:.0f} MB")
+    if registro["paginas"]:
+        st.table([
+            {"página": titulo, "primera carga (ms)": round(datos["ms"]), "+MB": round(datos["mb"], 1),
+             "módulos nuevos": datos["modulos"]}
+            for titulo, datos in registro["paginas"].items()
+        ])
@@ -1,8 +1,10 @@
 import io
-import qrcode
+import os
+import tempfile
 from qrcode.constants import ERROR_CORRECT_L, ERROR_CORRECT_M, ERROR_CORRECT_Q, ERROR_CORRECT_H
-from PIL import Image
 import streamlit as st
+from qr_core import estadisticas_cache, generar_qr_png_bytes
+from qr_lote import generar_zip, leer_payloads
 
 st.set_page_config(page_title="Generador de QR", page_icon="🔳", layout="centered")
 
@@ -28,21 +30,6 @@ texto = st.text_area("Texto / URL", placeholder="https://ejemplo.com o cualquier
 
 col1, col2 = st.columns([1,1])
 
-def generar_qr_png_bytes(data: str, box_size: int, border: int, ec_level, fill: str, back: str) -> bytes:
-    qr = qrcode.QRCode(
-        version=None,  # Automático según longitud
-        error_correction=ec_level,
-        box_size=box_size,
-        border=border,
-    )
-    qr.add_data(data)
-    qr.make(fit=True)
-    img: Image.Image = qr.make_image(fill_color=fill, back_color=back).convert("RGB")
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    buf.seek(0)
-    return buf.getvalue()
-
 with col1:
     generar = st.button("Generar QR", type="primary")
 
@@ -71,5 +58,46 @@ if generar:
 
         st.info("Tip: Escoge un nivel de corrección de errores más alto si planeas imprimir el QR o si podría ser parcialmente tapado.")
 
+# --- Generación por lote ---
+st.divider()
+st.subheader("Generación por lote")
+st.caption("Sube un CSV (columna `payload` y opcional `nombre`) o un JSONL y descarga todos los QR en un ZIP.")
+
+archivo_lote = st.file_uploader("Archivo de payloads", type=["csv", "jsonl", "ndjson"])
+formato_lote = st.radio("Formato", ["png", "svg"], horizontal=True)
+
+if archivo_lote is not None and st.button("Generar lote"):
+    texto_lote = io.TextIOWrapper(archivo_lote, encoding="utf-8", newline="")
+    estado = st.empty()
+    # El ZIP se escribe en disco a medida que llegan los bloques
+    zip_tmp = tempfile.NamedTemporaryFile(suffix=".zip", delete=False)
+    try:
+        with zip_tmp:
+            total, segundos = generar_zip(
+                leer_payloads(texto_lote, archivo_lote.name), zip_tmp,
+                formato=formato_lote, box_size=size, border=border,
+                ec_level=ec_map[ec_label], fill=fill_color, back=back_color,
+                progreso=lambda n: estado.text(f"{n} códigos generados…"),
+            )
+    except ValueError as error:
+        # Filas JSONL inválidas o sin payload, o un archivo que no es UTF-8
+        estado.empty()
+        st.error(f"No se pudo leer {archivo_lote.name}: {error}")
+    else:
+        estado.empty()
+        st.success(f"{total} códigos en {segundos:.2f} s ({total / segundos if segundos else 0:.1f} códigos/s)")
+        with open(zip_tmp.name, "rb") as zip_file:
+            st.download_button(
+                label="⬇️ Descargar ZIP",
+                data=zip_file,
+                file_name="qrs.zip",
+                mime="application/zip"
+            )
+    finally:
+        os.unlink(zip_tmp.name)
+
+with st.expander("Caché de renderizado"):
+    st.json(estadisticas_cache())
+
 st.divider()
 st.caption("Hecho con Streamlit y qrcode.")
@@ -0,0 +1,81 @@
+import argparse
+import time
+
+import qrcode
+from qrcode.exceptions import DataOverflowError
+
+from qr_core import EC_POR_LETRA, MOTORES_PNG, _svg_desde_matriz, construir_qr
+from qr_rapido import QRCodeRapido
+
+# Compara los motores de renderizado de QR (tiempo y tamaño del archivo) y el
+# codificador original de qrcode contra QRCodeRapido para distintos largos de
+# payload. Mide sin caché.
+#
+# Uso:
+#   python qr_benchmark.py
+#   python qr_benchmark.py --escalas 4 8 20 --repeticiones 50
+#   python qr_benchmark.py --largos 10 100 500 1000 2000 --ec H
+
+
+def medir(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        datos = funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000, len(datos)
+
+
+def comparar_motores(payload, escalas, ec, repeticiones):
+    modules = construir_qr(payload, box_size=1, border=0, ec_level=EC_POR_LETRA[ec]).modules
+    print(f"Payload de {len(payload)} caracteres, EC {ec}, {len(modules)}×{len(modules)} módulos")
+    print(f"{'escala':>6}  {'motor':<6}{'ms':>9}{'bytes':>10}")
+    for escala in escalas:
+        filas = [(nombre, medir(lambda f=f: f(modules, escala, 4, "#000000", "#FFFFFF"), repeticiones))
+                 for nombre, f in MOTORES_PNG.items()]
+        filas.append(("svg", medir(lambda: _svg_desde_matriz(modules, escala, 4, "#000000", "#FFFFFF"), repeticiones)))
+        for nombre, (ms, tamano) in filas:
+            print(f"{escala:>6}  {nombre:<6}{ms:>9.2f}{tamano:>10}")
+
+
+def _codificar(clase, payload, ec):
+    qr = clase(version=None, error_correction=EC_POR_LETRA[ec])
+    qr.add_data(payload)
+    qr.make(fit=True)
+    return qr
+
+
+def comparar_codificadores(largos, ec, repeticiones):
+    print(f"Codificador, EC {ec}")
+    print(f"{'bytes':>6}{'versión':>9}{'qrcode ms':>11}{'rápido ms':>11}{'x':>7}  matriz")
+    for largo in largos:
+        payload = ("https://ejemplo.com/?q=" * (largo // 23 + 1))[:largo]
+        try:
+            _codificar(QRCodeRapido, payload, ec)
+        except DataOverflowError:
+            print(f"{largo:>6}  no cabe en la versión 40 con EC {ec}")
+            continue
+        original_ms, _ = medir(lambda: [_codificar(qrcode.QRCode, payload, ec)], repeticiones)
+        rapido_ms, _ = medir(lambda: [_codificar(QRCodeRapido, payload, ec)], repeticiones)
+        original = _codificar(qrcode.QRCode, payload, ec)
+        rapido = _codificar(QRCodeRapido, payload, ec)
+        igual = "idéntica" if original.modules == rapido.modules else "DISTINTA"
+        print(f"{largo:>6}{rapido.version:>9}{original_ms:>11.2f}{rapido_ms:>11.2f}"
+              f"{original_ms / rapido_ms:>7.1f}  {igual}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de renderizado de códigos QR")
+    parser.add_argument("--payload", default="https://ejemplo.com/productos/12345?mesa=7&origen=qr")
+    parser.add_argument("--escalas", type=int, nargs="+", default=[2, 8, 20])
+    parser.add_argument("--ec", choices=sorted(EC_POR_LETRA), default="M")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--largos", type=int, nargs="+", default=[10, 50, 100, 250, 500, 1000, 1500, 2000],
+                        help="Largos de payload (bytes) para comparar codificadores; con --ec L/M/Q/H")
+    args = parser.parse_args(argv)
+
+    comparar_motores(args.payload, args.escalas, args.ec, args.repeticiones)
+    print()
+    comparar_codificadores(args.largos, args.ec, max(1, args.repeticiones // 4))
+
+
+if __name__ == "__main__":
+    main()
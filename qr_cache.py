@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+
+# Caché LRU con presupuesto en bytes, segura entre hilos.
+# Streamlit atiende cada sesión en un hilo del mismo proceso y los módulos
+# importados sobreviven a los reruns, así que una instancia a nivel de módulo
+# se comparte entre todas las sesiones.
+
+
+class LRUBytesCache:
+    def __init__(self, max_bytes: int, sizeof=len):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._items[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+        return value
+
+    def get_or_create(self, key, factory):
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, factory())
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entradas": len(self._items),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "aciertos": self.hits,
+                "fallos": self.misses,
+                "expulsiones": self.evictions,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.bytes = 0
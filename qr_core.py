@@ -0,0 +1,173 @@
+import io
+import numpy as np
+import qrcode
+from qrcode.constants import ERROR_CORRECT_L, ERROR_CORRECT_M, ERROR_CORRECT_Q, ERROR_CORRECT_H
+from qrcode.image.pil import PilImage
+from PIL import Image, ImageColor
+from qr_cache import LRUBytesCache
+from qr_rapido import QRCodeRapido
+
+# Funciones de generación de QR compartidas por qr.py, qr_wifi.py, qr_lote.py y
+# qr_verificar.py (sin Streamlit, se pueden importar desde procesos worker o scripts)
+
+# Nivel de corrección por letra, para línea de comandos y archivos
+EC_POR_LETRA = {
+    "L": ERROR_CORRECT_L,
+    "M": ERROR_CORRECT_M,
+    "Q": ERROR_CORRECT_Q,
+    "H": ERROR_CORRECT_H,
+}
+
+# Caché en dos capas, compartida por todas las sesiones del proceso (páginas de
+# Streamlit; los workers de lote usan renderizar_qr, sin caché):
+#  - matrices: módulos del QR por (payload, ec_level); cambiar solo colores,
+#    escala o borde reutiliza la matriz
+#  - imágenes: bytes PNG/SVG ya codificados por todos los parámetros
+CACHE_MATRICES = LRUBytesCache(16 * 1024 * 1024, sizeof=lambda modules: 8 * len(modules) ** 2)
+CACHE_IMAGENES = LRUBytesCache(64 * 1024 * 1024)
+
+
+def construir_qr(data: str, box_size: int, border: int, ec_level) -> qrcode.QRCode:
+    # Misma matriz que qrcode.QRCode, con selección de versión y máscara más rápida
+    qr = QRCodeRapido(
+        version=None,  # Automático según longitud
+        error_correction=ec_level,
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr
+
+
+def matriz_qr(data: str, ec_level) -> list:
+    """
+    Matriz de módulos (lista de filas de bool, sin borde), desde la caché.
+    """
+    return CACHE_MATRICES.get_or_create(
+        (data, ec_level),
+        lambda: construir_qr(data, box_size=1, border=0, ec_level=ec_level).modules,
+    )
+
+
+def _png_desde_matriz(modules: list, box_size: int, border: int, fill: str, back: str) -> bytes:
+    """
+    Motor "pil": dibuja módulo por módulo con qrcode/PIL y guarda un PNG RGB de 24 bits.
+    """
+    img = PilImage(border, len(modules), box_size, qrcode_modules=modules, fill_color=fill, back_color=back)
+    for r, fila in enumerate(modules):
+        for c, activo in enumerate(fila):
+            if activo:
+                img.drawrect(r, c)
+    buf = io.BytesIO()
+    img.convert("RGB").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _png_1bit_desde_matriz(modules: list, box_size: int, border: int, fill: str, back: str) -> bytes:
+    """
+    Motor "numpy": escala la matriz booleana con np.repeat y guarda un PNG de
+    paleta de 2 colores y 1 bit por píxel (índice 0 = fondo, 1 = QR).
+    """
+    matriz = np.pad(np.asarray(modules, dtype=np.uint8), border)
+    pixeles = matriz.repeat(box_size, axis=0).repeat(box_size, axis=1)
+    alto, ancho = pixeles.shape
+    img = Image.frombytes("P", (ancho, alto), pixeles.tobytes())
+    img.putpalette(ImageColor.getrgb(back)[:3] + ImageColor.getrgb(fill)[:3])
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", bits=1)
+    return buf.getvalue()
+
+
+def _svg_desde_matriz(modules: list, box_size: int, border: int, fill: str, back: str) -> bytes:
+    """
+    SVG con un solo <path>: un rectángulo por cada tramo horizontal de
+    módulos oscuros. Las coordenadas están en módulos (viewBox), así que el
+    tamaño del archivo no depende de la escala; box_size solo fija width/height.
+    """
+    n = len(modules) + 2 * border
+    tramos = []
+    for y, fila in enumerate(modules):
+        x = 0
+        ancho = len(fila)
+        while x < ancho:
+            if fila[x]:
+                inicio = x
+                while x < ancho and fila[x]:
+                    x += 1
+                largo = x - inicio
+                tramos.append(f"M{inicio + border},{y + border}h{largo}v1h-{largo}z")
+            else:
+                x += 1
+    lado = n * box_size
+    fondo = f'<rect width="{n}" height="{n}" fill="{back}"/>' if back else ""
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{lado}" height="{lado}" '
+        f'viewBox="0 0 {n} {n}" shape-rendering="crispEdges">'
+        f'{fondo}<path fill="{fill}" d="{"".join(tramos)}"/></svg>'
+    )
+    return svg.encode("utf-8")
+
+
+# Motores de PNG disponibles; "numpy" es el más rápido y genera archivos más chicos
+MOTORES_PNG = {
+    "numpy": _png_1bit_desde_matriz,
+    "pil": _png_desde_matriz,
+}
+
+
+def generar_qr_png_bytes(data: str, box_size: int, border: int, ec_level, fill: str, back: str,
+                         motor: str = "numpy") -> bytes:
+    renderizar = MOTORES_PNG[motor]
+    return CACHE_IMAGENES.get_or_create(
+        ("png", motor, data, box_size, border, ec_level, fill, back),
+        lambda: renderizar(matriz_qr(data, ec_level), box_size, border, fill, back),
+    )
+
+
+def generar_qr_svg_bytes(data: str, box_size: int, border: int, ec_level, fill: str, back: str) -> bytes:
+    return CACHE_IMAGENES.get_or_create(
+        ("svg", data, box_size, border, ec_level, fill, back),
+        lambda: _svg_desde_matriz(matriz_qr(data, ec_level), box_size, border, fill, back),
+    )
+
+
+def renderizar_qr(data: str, box_size: int, border: int, ec_level, fill: str, back: str,
+                  formato: str = "png", motor: str = "numpy") -> bytes:
+    """
+    PNG o SVG sin pasar por las cachés. Para los workers de lote: sus
+    payloads casi nunca se repiten y la caché solo acumularía memoria.
+    """
+    modules = construir_qr(data, box_size=1, border=0, ec_level=ec_level).modules
+    renderizar = _svg_desde_matriz if formato == "svg" else MOTORES_PNG[motor]
+    return renderizar(modules, box_size, border, fill, back)
+
+
+# --- Payload de QR Wi-Fi (usado por qr_wifi.py) ---
+def escape_wifi(value: str) -> str:
+    """
+    Escapa caracteres especiales según la convención de QR Wi-Fi:
+    se escapan: backslash, punto y coma, coma, dos puntos y comillas.
+    """
+    return (
+        value.replace("\\", r"\\")
+             .replace(";", r"\;")
+             .replace(",", r"\,")
+             .replace(":", r"\:")
+             .replace('"', r'\"')
+    )
+
+
+def make_wifi_payload(ssid: str, password: str, security: str, hidden: bool) -> str:
+    s = escape_wifi(ssid)
+    h = ";H:true" if hidden else ""
+    if security == "Sin contraseña (abierta)":
+        return f"WIFI:T:nopass;S:{s}{h};;"
+    else:
+        t = "WEP" if security == "WEP" else "WPA"  # WPA aplica a WPA/WPA2/WPA3-Personal
+        p = escape_wifi(password)
+        return f"WIFI:T:{t};S:{s};P:{p}{h};;"
+
+
+def estadisticas_cache() -> dict:
+    return {"matrices": CACHE_MATRICES.stats(), "imagenes": CACHE_IMAGENES.stats()}
@@ -0,0 +1,190 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+import types
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from qr_core import EC_POR_LETRA, renderizar_qr
+
+# Generación masiva de QR: CSV/JSONL de entrada, ZIP de PNG/SVG de salida.
+# Los códigos se generan en un pool de procesos por bloques y se escriben en
+# el ZIP a medida que llegan, sin mantener todas las imágenes en memoria.
+#
+# Uso:
+#   python qr_lote.py productos.csv -o qrs.zip
+#   python qr_lote.py mesas.jsonl -o qrs.zip --formato svg --ec H --workers 8
+
+FORMATOS = ("png", "svg")
+
+
+def leer_payloads(archivo, nombre_archivo=""):
+    """
+    Lee (nombre, payload) desde un archivo de texto abierto.
+    CSV: columna 'payload' (o la primera) y 'nombre' opcional.
+    JSONL: objetos con 'payload' y 'nombre' opcional, o cadenas sueltas.
+    Una línea JSONL inválida o sin 'payload' lanza ValueError con su número.
+    """
+    if nombre_archivo.lower().endswith((".jsonl", ".ndjson")):
+        for numero, linea in enumerate(archivo, start=1):
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                item = json.loads(linea)
+            except json.JSONDecodeError as error:
+                raise ValueError(f"línea {numero}: JSON inválido ({error.msg})") from error
+            if isinstance(item, dict):
+                if "payload" not in item:
+                    raise ValueError(f"línea {numero}: falta 'payload'")
+                yield item.get("nombre"), str(item["payload"])
+            else:
+                yield None, str(item)
+        return
+
+    lector = csv.reader(archivo)
+    encabezado = next(lector, None)
+    if encabezado is None:
+        return
+    columnas = [c.strip().lower() for c in encabezado]
+    if "payload" in columnas:
+        i_payload = columnas.index("payload")
+        i_nombre = columnas.index("nombre") if "nombre" in columnas else None
+    else:
+        # Sin encabezado reconocible: la primera fila también es un dato
+        i_payload, i_nombre = 0, None
+        if encabezado and encabezado[0].strip():
+            yield None, encabezado[0].strip()
+    for fila in lector:
+        if len(fila) <= i_payload or not fila[i_payload].strip():
+            continue
+        nombre = fila[i_nombre] if i_nombre is not None and len(fila) > i_nombre else None
+        yield nombre, fila[i_payload].strip()
+
+
+def nombre_seguro(nombre, indice, extension):
+    base = re.sub(r"[^\w\-.]+", "_", nombre).strip("._") if nombre else ""
+    return f"{base or f'qr_{indice:06d}'}.{extension}"
+
+
+def generar_bloque(bloque, formato, box_size, border, ec_level, fill, back):
+    """
+    Worker: genera las imágenes de un bloque de (indice, nombre, payload), sin caché.
+    """
+    return [
+        (nombre_seguro(nombre, indice, formato),
+         renderizar_qr(payload, box_size, border, ec_level, fill, back, formato))
+        for indice, nombre, payload in bloque
+    ]
+
+
+def _arrancar_workers(pool, workers):
+    """
+    Arranca los `workers` procesos spawn del pool antes del primer bloque.
+    spawn vuelve a ejecutar el archivo de __main__ en cada worker; dentro de
+    Streamlit ese es el script de la página (p. ej. principal.py), que falla
+    fuera de una sesión. Si el worker no vive en __main__ (es decir, qr_lote
+    fue importado), los procesos arrancan con un __main__ vacío.
+    """
+    principal = sys.modules["__main__"]
+    vacio = types.ModuleType("__main__")
+    if generar_bloque.__module__ != "__main__":
+        sys.modules["__main__"] = vacio
+    try:
+        # Sin workers ociosos, cada submit lanza un proceso nuevo
+        iniciados = [pool.submit(int) for _ in range(workers)]
+    finally:
+        # Streamlit pudo instalar otro __main__ mientras tanto (otra sesión)
+        if sys.modules["__main__"] is vacio:
+            sys.modules["__main__"] = principal
+    for futuro in iniciados:
+        futuro.result()
+
+
+def _bloques(items, tamano):
+    bloque = []
+    for indice, (nombre, payload) in enumerate(items, start=1):
+        bloque.append((indice, nombre, payload))
+        if len(bloque) >= tamano:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+def generar_zip(items, destino, formato="png", box_size=8, border=4, ec_level=EC_POR_LETRA["M"],
+                fill="#000000", back="#FFFFFF", workers=None, tamano_bloque=64, progreso=None):
+    """
+    Genera un QR por cada (nombre, payload) y los escribe en un ZIP.
+    destino: ruta o archivo binario abierto. progreso(n) se llama tras cada bloque.
+    Retorna (cantidad, segundos).
+    """
+    workers = workers or os.cpu_count() or 1
+    inicio = time.perf_counter()
+    total = 0
+    usados = set()
+    # PNG ya viene comprimido: se guarda sin volver a comprimir
+    compresion = zipfile.ZIP_STORED if formato == "png" else zipfile.ZIP_DEFLATED
+    # spawn: generar_zip también corre dentro del servidor de Streamlit, que
+    # tiene hilos; hacer fork de un proceso con hilos puede bloquear los workers
+    ctx = multiprocessing.get_context("spawn")
+    with zipfile.ZipFile(destino, "w", compression=compresion) as zf, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        _arrancar_workers(pool, workers)
+        bloques = _bloques(items, tamano_bloque)
+        pendientes = deque()
+
+        def enviar():
+            bloque = next(bloques, None)
+            if bloque is not None:
+                pendientes.append(pool.submit(generar_bloque, bloque, formato, box_size, border, ec_level, fill, back))
+
+        # Ventana acotada de bloques en vuelo: memoria constante
+        for _ in range(workers * 2):
+            enviar()
+        while pendientes:
+            for nombre, datos in pendientes.popleft().result():
+                if nombre in usados:
+                    raiz, ext = os.path.splitext(nombre)
+                    nombre = f"{raiz}_{total + 1}{ext}"
+                usados.add(nombre)
+                zf.writestr(nombre, datos)
+                total += 1
+            enviar()
+            if progreso is not None:
+                progreso(total)
+    return total, time.perf_counter() - inicio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generación masiva de códigos QR a un ZIP")
+    parser.add_argument("entrada", help="Archivo .csv o .jsonl con los payloads")
+    parser.add_argument("-o", "--salida", default="qrs.zip", help="ZIP de salida")
+    parser.add_argument("--formato", choices=FORMATOS, default="png")
+    parser.add_argument("--tamano", type=int, default=8, help="Escala de cada módulo (box_size)")
+    parser.add_argument("--borde", type=int, default=4, help="Borde en módulos")
+    parser.add_argument("--ec", choices=sorted(EC_POR_LETRA), default="M", help="Corrección de errores")
+    parser.add_argument("--color", default="#000000", help="Color del QR")
+    parser.add_argument("--fondo", default="#FFFFFF", help="Color de fondo")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos (por defecto, núcleos disponibles)")
+    args = parser.parse_args(argv)
+
+    with open(args.entrada, encoding="utf-8", newline="") as archivo:
+        total, segundos = generar_zip(
+            leer_payloads(archivo, args.entrada), args.salida,
+            formato=args.formato, box_size=args.tamano, border=args.borde,
+            ec_level=EC_POR_LETRA[args.ec], fill=args.color, back=args.fondo,
+            workers=args.workers,
+        )
+    print(f"✅ {total} códigos en {segundos:.2f} s ({total / segundos if segundos else 0:.1f} códigos/s) -> {args.salida}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
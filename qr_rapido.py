@@ -0,0 +1,122 @@
+from bisect import bisect_left
+
+import numpy as np
+import qrcode
+from qrcode import exceptions, util
+
+# Codificador QR optimizado. Produce exactamente la misma matriz que
+# qrcode.QRCode, pero:
+#  - la versión se elige calculando los bits necesarios con aritmética sobre
+#    la tabla de capacidad (sin escribir los datos en un BitBuffer)
+#  - la máscara se elige construyendo la matriz una sola vez y puntuando las
+#    8 máscaras con operaciones de arreglos (NumPy) en vez de 8 pasadas en Python
+
+# Bits del último grupo en modo numérico según cuántos dígitos sobran
+_BITS_RESTO_NUMERICO = {0: 0, 1: 4, 2: 7}
+
+# Patrones 1:1:3:1:1 con 4 módulos claros antes o después (regla 3)
+_PATRON_1 = np.array([1, 0, 1, 1, 1, 0, 1, 0, 0, 0, 0], dtype=bool)
+_PATRON_2 = np.array([0, 0, 0, 0, 1, 0, 1, 1, 1, 0, 1], dtype=bool)
+
+_mascaras_cache = {}
+
+
+def _bits_datos(data: util.QRData) -> int:
+    n = len(data)
+    if data.mode == util.MODE_NUMBER:
+        return 10 * (n // 3) + _BITS_RESTO_NUMERICO[n % 3]
+    if data.mode == util.MODE_ALPHA_NUM:
+        return 11 * (n // 2) + 6 * (n % 2)
+    return 8 * n
+
+
+def mascaras(n: int) -> np.ndarray:
+    """
+    Las 8 máscaras de QR para una matriz de n×n, como arreglo (8, n, n) de bool.
+    """
+    if n not in _mascaras_cache:
+        i, j = np.indices((n, n))
+        _mascaras_cache[n] = np.stack([
+            (i + j) % 2 == 0,
+            i % 2 == 0,
+            j % 3 == 0,
+            (i + j) % 3 == 0,
+            (i // 2 + j // 3) % 2 == 0,
+            (i * j) % 2 + (i * j) % 3 == 0,
+            ((i * j) % 2 + (i * j) % 3) % 2 == 0,
+            ((i * j) % 3 + (i + j) % 2) % 2 == 0,
+        ])
+    return _mascaras_cache[n]
+
+
+def _penalizacion_tramos(lineas: np.ndarray) -> int:
+    # Regla 1: cada tramo de 5 o más módulos iguales suma (largo - 2)
+    k, n = lineas.shape
+    cambios = np.ones((k, n + 1), dtype=bool)
+    cambios[:, 1:n] = lineas[:, 1:] != lineas[:, :-1]
+    largos = np.diff(np.flatnonzero(cambios))
+    largos = largos[largos >= 5]
+    return int((largos - 2).sum())
+
+
+def _penalizacion_patrones(lineas: np.ndarray) -> int:
+    # Regla 3: 40 puntos por cada ventana de 11 módulos igual a un patrón
+    ventanas = np.lib.stride_tricks.sliding_window_view(lineas, 11, axis=1)
+    coincide = (ventanas == _PATRON_1).all(axis=2) | (ventanas == _PATRON_2).all(axis=2)
+    return 40 * int(coincide.sum())
+
+
+def puntaje_mascara(m: np.ndarray) -> int:
+    """
+    Equivalente vectorizado de qrcode.util.lost_point para una matriz de bool.
+    """
+    n = m.shape[0]
+    puntos = _penalizacion_tramos(m) + _penalizacion_tramos(m.T)
+
+    # Regla 2: bloques 2×2 del mismo color
+    a = m[:-1, :-1]
+    bloques = (a == m[:-1, 1:]) & (a == m[1:, :-1]) & (a == m[1:, 1:])
+    puntos += 3 * int(bloques.sum())
+
+    if n > 10:
+        puntos += _penalizacion_patrones(m) + _penalizacion_patrones(m.T)
+
+    # Regla 4: proporción de módulos oscuros (misma aritmética que qrcode)
+    porcentaje = float(int(m.sum())) / (n ** 2)
+    puntos += int(abs(porcentaje * 100 - 50) / 5) * 10
+    return puntos
+
+
+class QRCodeRapido(qrcode.QRCode):
+    def best_fit(self, start=None):
+        if start is None:
+            start = 1
+        util.check_version(start)
+
+        # Igual que QRCode.best_fit pero contando los bits en vez de escribirlos
+        mode_sizes = util.mode_sizes_for_version(start)
+        needed_bits = sum(4 + mode_sizes[data.mode] + _bits_datos(data) for data in self.data_list)
+        version = bisect_left(util.BIT_LIMIT_TABLE[self.error_correction], needed_bits, start)
+        if version == 41:
+            raise exceptions.DataOverflowError()
+        self.version = version
+
+        if mode_sizes is not util.mode_sizes_for_version(self.version):
+            self.best_fit(start=self.version)
+        return self.version
+
+    def map_data(self, data, mask_pattern):
+        # Los módulos aún vacíos son los que llevan datos (afectados por la máscara)
+        self._zona_datos = np.array([[cell is None for cell in row] for row in self.modules], dtype=bool)
+        super().map_data(data, mask_pattern)
+
+    def best_mask_pattern(self):
+        # Una sola construcción con la máscara 0 (modo prueba: información de
+        # formato en blanco, igual para todas las máscaras)
+        self.makeImpl(True, 0)
+        m0 = np.array(self.modules, dtype=bool)
+        todas = mascaras(self.modules_count) & self._zona_datos
+        sin_mascara = m0 ^ todas[0]
+        puntajes = [puntaje_mascara(sin_mascara ^ mascara) for mascara in todas]
+        # argmin devuelve el primer mínimo, igual que QRCode.best_mask_pattern
+        return int(np.argmin(puntajes))
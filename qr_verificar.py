@@ -0,0 +1,180 @@
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+from PIL import ImageColor
+
+from qr_core import EC_POR_LETRA, renderizar_qr
+from qr_lote import _bloques, leer_payloads, nombre_seguro
+
+# Verificación de lectura de QR generados: cada PNG se decodifica con el
+# detector de OpenCV, a escala original y reducida, y se compara con el
+# payload esperado. Los bloques de imágenes se reparten en un pool de procesos.
+#
+# Uso:
+#   python qr_verificar.py productos.csv --tamano 8 --ec M
+#   python qr_verificar.py wifi.jsonl --color "#333333" --fondo "#EEEEEE" --escalas 1 0.5 0.25
+
+# Un detector por proceso (se crea al primer uso)
+_detector = None
+
+
+def _detector_qr():
+    global _detector
+    if _detector is None:
+        _detector = cv2.QRCodeDetector()
+    return _detector
+
+
+def contraste(fill: str, back: str) -> float:
+    """
+    Relación de contraste (WCAG) entre dos colores (hex o nombre, como en
+    renderizar_qr); 21 es blanco/negro.
+    """
+    def luminancia(color):
+        canales = [c / 255 for c in ImageColor.getrgb(color)[:3]]
+        lineales = [c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4 for c in canales]
+        return 0.2126 * lineales[0] + 0.7152 * lineales[1] + 0.0722 * lineales[2]
+
+    claro, oscuro = sorted((luminancia(fill), luminancia(back)), reverse=True)
+    return (claro + 0.05) / (oscuro + 0.05)
+
+
+def campos_wifi(texto: str) -> dict:
+    """
+    Separa un payload WIFI:...;; en sus campos quitando los escapes de
+    escape_wifi (inverso de make_wifi_payload).
+    """
+    if not texto.startswith("WIFI:"):
+        return {}
+    campos = {}
+    clave, valor, escapado = "", "", False
+    actual = "clave"
+    for ch in texto[5:]:
+        if escapado:
+            valor += ch
+            escapado = False
+        elif ch == "\\":
+            escapado = True
+        elif actual == "clave" and ch == ":":
+            actual = "valor"
+        elif ch == ";":
+            if clave:
+                campos[clave] = valor
+            clave, valor, actual = "", "", "clave"
+        elif actual == "clave":
+            clave += ch
+        else:
+            valor += ch
+    return campos
+
+
+def verificar_png(png: bytes, payload: str, escalas=(1.0, 0.5)) -> dict:
+    """
+    Decodifica un PNG a cada escala y lo compara con el payload.
+    Retorna {"ok", "fallos": [(escala, texto_leido)], "ms": [latencia por escala]}.
+    """
+    detector = _detector_qr()
+    img = cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_GRAYSCALE)
+    fallos = []
+    latencias = []
+    for escala in escalas:
+        muestra = img if escala == 1.0 else cv2.resize(img, None, fx=escala, fy=escala,
+                                                         interpolation=cv2.INTER_AREA)
+        inicio = time.perf_counter()
+        texto, _, _ = detector.detectAndDecode(muestra)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        if texto != payload:
+            fallos.append((escala, texto))
+    return {"ok": not fallos, "fallos": fallos, "ms": latencias}
+
+
+def verificar_bloque(bloque, escalas, box_size, border, ec_level, fill, back):
+    """
+    Worker: genera y verifica un bloque de (indice, nombre, payload).
+    """
+    # El paralelismo lo da el pool: evitar que OpenCV abra hilos en cada worker
+    cv2.setNumThreads(1)
+    resultados = []
+    for indice, nombre, payload in bloque:
+        png = renderizar_qr(payload, box_size, border, ec_level, fill, back)
+        resultado = verificar_png(png, payload, escalas)
+        resultado["nombre"] = nombre_seguro(nombre, indice, "png")
+        resultado["payload"] = payload
+        resultados.append(resultado)
+    return resultados
+
+
+def verificar_lote(items, escalas=(1.0, 0.5), box_size=8, border=4, ec_level=EC_POR_LETRA["M"],
+                   fill="#000000", back="#FFFFFF", workers=None, tamano_bloque=64):
+    """
+    Verifica (nombre, payload) en paralelo. Genera los resultados en orden.
+    Lee `items` a medida que avanza, con una ventana acotada de bloques en vuelo.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        bloques = _bloques(items, tamano_bloque)
+        pendientes = deque()
+
+        def enviar():
+            bloque = next(bloques, None)
+            if bloque is not None:
+                pendientes.append(pool.submit(verificar_bloque, bloque, escalas, box_size, border, ec_level, fill, back))
+
+        for _ in range(workers * 2):
+            enviar()
+        while pendientes:
+            resultados = pendientes.popleft().result()
+            enviar()
+            yield from resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica que los QR generados se lean correctamente")
+    parser.add_argument("entrada", help="Archivo .csv o .jsonl con los payloads")
+    parser.add_argument("--escalas", type=float, nargs="+", default=[1.0, 0.5], help="Escalas a probar (1 = original)")
+    parser.add_argument("--tamano", type=int, default=8, help="Escala de cada módulo (box_size)")
+    parser.add_argument("--borde", type=int, default=4, help="Borde en módulos")
+    parser.add_argument("--ec", choices=sorted(EC_POR_LETRA), default="M", help="Corrección de errores")
+    parser.add_argument("--color", default="#000000", help="Color del QR")
+    parser.add_argument("--fondo", default="#FFFFFF", help="Color de fondo")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos (por defecto, núcleos disponibles)")
+    args = parser.parse_args(argv)
+
+    print(f"Contraste color/fondo: {contraste(args.color, args.fondo):.1f}:1", file=sys.stderr)
+
+    inicio = time.perf_counter()
+    total = 0
+    errores = 0
+    latencias = []
+    with open(args.entrada, encoding="utf-8", newline="") as archivo:
+        for resultado in verificar_lote(
+            leer_payloads(archivo, args.entrada), escalas=tuple(args.escalas),
+            box_size=args.tamano, border=args.borde, ec_level=EC_POR_LETRA[args.ec],
+            fill=args.color, back=args.fondo, workers=args.workers,
+        ):
+            total += 1
+            latencias.extend(resultado["ms"])
+            if not resultado["ok"]:
+                errores += 1
+                for escala, leido in resultado["fallos"]:
+                    print(f"❌ {resultado['nombre']} (escala {escala}): esperado {resultado['payload']!r}, leído {leido!r}")
+    segundos = time.perf_counter() - inicio
+
+    if latencias:
+        latencias.sort()
+        p50 = latencias[len(latencias) // 2]
+        p95 = latencias[min(len(latencias) - 1, int(len(latencias) * 0.95))]
+        print(f"Decodificación: p50 {p50:.2f} ms, p95 {p95:.2f} ms por imagen", file=sys.stderr)
+    print(f"{'✅' if not errores else '⚠️'} {total - errores}/{total} códigos verificados en {segundos:.2f} s",
+          file=sys.stderr)
+    sys.exit(1 if errores else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,11 @@
-import io
-import qrcode
 from qrcode.constants import ERROR_CORRECT_M, ERROR_CORRECT_Q, ERROR_CORRECT_H, ERROR_CORRECT_L
-from PIL import Image
 import streamlit as st
+from qr_core import estadisticas_cache, generar_qr_png_bytes, make_wifi_payload
 
 st.set_page_config(page_title="QR Wi-Fi", page_icon="📶", layout="centered")
 st.title("📶 Generador de QR para Wi-Fi")
 st.caption("Escanéalo con tu cámara o Google Lens para unirte a la red.")
 
-# ---------------- Utilidades ----------------
-def escape_wifi(value: str) -> str:
-    """
-    Escapa caracteres especiales según la convención de QR Wi-Fi:
-    se escapan: backslash, punto y coma, coma, dos puntos y comillas.
-    """
-    return (
-        value.replace("\\", r"\\")
-             .replace(";", r"\;")
-             .replace(",", r"\,")
-             .replace(":", r"\:")
-             .replace('"', r'\"')
-    )
-
-def make_wifi_payload(ssid: str, password: str, security: str, hidden: bool) -> str:
-    s = escape_wifi(ssid)
-    h = ";H:true" if hidden else ""
-    if security == "Sin contraseña (abierta)":
-        return f"WIFI:T:nopass;S:{s}{h};;"
-    else:
-        t = "WEP" if security == "WEP" else "WPA"  # WPA aplica a WPA/WPA2/WPA3-Personal
-        p = escape_wifi(password)
-        return f"WIFI:T:{t};S:{s};P:{p}{h};;"
-
-def qr_png_bytes(data: str, box_size: int, border: int, ec_level, fill: str, back: str) -> bytes:
-    qr = qrcode.QRCode(
-        version=None,
-        error_correction=ec_level,
-        box_size=box_size,
-        border=border,
-    )
-    qr.add_data(data)
-    qr.make(fit=True)
-    img: Image.Image = qr.make_image(fill_color=fill, back_color=back).convert("RGB")
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    buf.seek(0)
-    return buf.getvalue()
-
 # ---------------- Entrada principal ----------------
 with st.form("wifi_form"):
     ssid = st.text_input("SSID (nombre de la red)", placeholder="MiRedKFC")
@@ -71,6 +30,7 @@ with st.form("wifi_form"):
         ec_label = st.selectbox("Corrección de errores", ["Baja (L)", "Media (M)", "Alta (Q)", "Máx (H)"], index=1)
     fill_color = st.color_picker("Color del QR", "#000000")
     back_color = st.color_picker("Color de fondo", "#FFFFFF")
+    verificar = st.checkbox("Verificar lectura (OpenCV, también reducido al 50 %)", value=False)
 
     submitted = st.form_submit_button("Generar QR", type="primary")
 
@@ -95,7 +55,7 @@ if submitted:
             security=security,
             hidden=hidden
         )
-        png = qr_png_bytes(
+        png = generar_qr_png_bytes(
             data=payload,
             box_size=size,
             border=border,
@@ -117,5 +77,23 @@ if submitted:
         with st.expander("Ver texto codificado (avanzado)"):
             st.code(payload, language="text")
 
+        if verificar:
+            from qr_verificar import campos_wifi, contraste, verificar_png
+            resultado = verificar_png(png, payload, escalas=(1.0, 0.5))
+            campos = campos_wifi(payload)
+            escapes_ok = campos.get("S") == ssid.strip() and campos.get("P", "") == password
+            latencia = " / ".join(f"{ms:.1f} ms" for ms in resultado["ms"])
+            if resultado["ok"] and escapes_ok:
+                st.success(f"El QR se lee correctamente ({latencia}).")
+            else:
+                for escala, leido in resultado["fallos"]:
+                    st.error(f"No se leyó bien a escala {escala:g}: {leido!r}")
+                if not escapes_ok:
+                    st.error("El SSID o la contraseña no se recuperan igual desde el payload.")
+            st.caption(f"Contraste color/fondo: {contraste(fill_color, back_color):.1f}:1")
+
+with st.expander("Caché de renderizado"):
+    st.json(estadisticas_cache())
+
 st.divider()
 st.caption("Nota: este QR funciona para redes personales (no Enterprise 802.1X). Mantén privada tu contraseña.")
@@ -0,0 +1,163 @@
+import argparse
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Recorta muchos videos a la vez con ffmpeg, sin recodificar (copia de stream).
+# Reemplaza a recortar.bat: funciona en Linux/macOS/Windows, acepta carpetas o
+# patrones glob y omite las salidas que ya están al día.
+#
+# -ss va ANTES de -i: ffmpeg salta por el índice del contenedor al keyframe
+# previo al inicio en vez de leer y descartar todo desde el principio.
+#
+# Uso:
+#   python recortar.py prueba.mp4                      # primeros 5 s -> prueba_5s.mp4
+#   python recortar.py videos/ --inicio 30 --duracion 10 --salida recortes/
+#   python recortar.py "descargas/*.mp4" --workers 8
+
+EXTENSIONES = (".mp4", ".mkv", ".mov", ".webm", ".m4v", ".avi")
+
+
+def _num(segundos: float) -> str:
+    return f"{segundos:g}"
+
+
+def es_temporal(ruta: str) -> bool:
+    """
+    True si es un temporal a medias que dejó recortar (nombre.tmp.ext).
+    """
+    return os.path.splitext(os.path.basename(ruta))[0].endswith(".tmp")
+
+
+def buscar_videos(entradas, extensiones=EXTENSIONES) -> list:
+    """
+    Expande archivos, carpetas (no recursivo) y patrones glob a una lista de videos.
+    De carpetas y globs se omiten los temporales; un archivo nombrado
+    explícitamente siempre se usa.
+    """
+    videos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            candidatos = sorted(os.path.join(entrada, nombre) for nombre in os.listdir(entrada))
+            videos.extend(c for c in candidatos
+                          if c.lower().endswith(extensiones) and not es_temporal(c) and os.path.isfile(c))
+        elif os.path.isfile(entrada):
+            videos.append(entrada)
+        else:
+            videos.extend(c for c in sorted(glob.glob(entrada)) if not es_temporal(c))
+    # Sin duplicados, en el orden dado
+    return list(dict.fromkeys(videos))
+
+
+def ruta_salida(video: str, inicio: float, duracion: float, carpeta=None) -> str:
+    base, ext = os.path.splitext(os.path.basename(video))
+    sufijo = f"_{_num(inicio)}+{_num(duracion)}s" if inicio else f"_{_num(duracion)}s"
+    return os.path.join(carpeta or os.path.dirname(video), f"{base}{sufijo}{ext}")
+
+
+def al_dia(video: str, salida: str) -> bool:
+    return os.path.exists(salida) and os.path.getmtime(salida) >= os.path.getmtime(video)
+
+
+def comando_ffmpeg(ffmpeg, video, salida, inicio, duracion) -> list:
+    return [
+        ffmpeg, "-hide_banner", "-loglevel", "error", "-nostdin", "-y",
+        "-ss", _num(inicio), "-i", video,
+        "-t", _num(duracion),
+        "-map", "0", "-c", "copy",
+        "-avoid_negative_ts", "make_zero",
+        salida,
+    ]
+
+
+def recortar(video, salida, inicio, duracion, ffmpeg="ffmpeg") -> dict:
+    """
+    Recorta un video. Escribe a un archivo temporal y lo renombra al final,
+    para que una salida a medias nunca parezca al día.
+    """
+    base, ext = os.path.splitext(salida)
+    temporal = f"{base}.tmp{ext}"
+    inicio_t = time.perf_counter()
+    proceso = subprocess.run(comando_ffmpeg(ffmpeg, video, temporal, inicio, duracion),
+                             capture_output=True, text=True)
+    segundos = time.perf_counter() - inicio_t
+    if proceso.returncode != 0:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        lineas = proceso.stderr.strip().splitlines()
+        return {"video": video, "salida": salida, "estado": "error", "segundos": segundos,
+                "error": lineas[-1] if lineas else f"código {proceso.returncode}"}
+    os.replace(temporal, salida)
+    return {"video": video, "salida": salida, "estado": "ok", "segundos": segundos,
+            "bytes": os.path.getsize(salida)}
+
+
+def recortar_lote(videos, inicio=0.0, duracion=5.0, carpeta=None, workers=None, forzar=False, ffmpeg="ffmpeg"):
+    """
+    Recorta los videos con un pool de `workers` procesos ffmpeg y genera un
+    resumen por archivo a medida que terminan.
+    """
+    workers = workers or os.cpu_count() or 1
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    # Al recortar en la misma carpeta, las salidas de esta corrida (que pueden existir
+    # de una corrida anterior con los mismos parámetros) no son entradas
+    salidas = {os.path.normpath(ruta_salida(video, inicio, duracion, carpeta)) for video in videos}
+    videos = [video for video in videos if os.path.normpath(video) not in salidas]
+    trabajos = []
+    for video in videos:
+        salida = ruta_salida(video, inicio, duracion, carpeta)
+        if not forzar and al_dia(video, salida):
+            yield {"video": video, "salida": salida, "estado": "al día", "segundos": 0.0}
+        else:
+            trabajos.append((video, salida))
+
+    # Hilos: el trabajo pesado lo hacen los procesos ffmpeg
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futuros = [pool.submit(recortar, video, salida, inicio, duracion, ffmpeg) for video, salida in trabajos]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recorta videos en lote con ffmpeg (copia de stream)")
+    parser.add_argument("entradas", nargs="+", help="Archivos, carpetas o patrones glob")
+    parser.add_argument("--inicio", type=float, default=0.0, help="Segundo de inicio")
+    parser.add_argument("--duracion", type=float, default=5.0, help="Duración del recorte en segundos")
+    parser.add_argument("--salida", help="Carpeta de salida (por defecto, junto a cada video)")
+    parser.add_argument("--workers", type=int, default=None, help="Recortes simultáneos (por defecto, núcleos)")
+    parser.add_argument("--forzar", action="store_true", help="Recortar aunque la salida esté al día")
+    parser.add_argument("--ffmpeg", default=shutil.which("ffmpeg"), help="Ruta del ejecutable de ffmpeg")
+    args = parser.parse_args(argv)
+
+    if not args.ffmpeg:
+        parser.error("no se encontró ffmpeg en el PATH; indícalo con --ffmpeg")
+    if args.duracion <= 0 or args.inicio < 0:
+        parser.error("--duracion debe ser positiva e --inicio no negativo")
+    videos = buscar_videos(args.entradas)
+    if not videos:
+        parser.error("no se encontraron videos")
+
+    print(f"✂️ {len(videos)} videos, desde {_num(args.inicio)} s, {_num(args.duracion)} s de duración")
+    inicio = time.perf_counter()
+    estados = {"ok": 0, "al día": 0, "error": 0}
+    for resumen in recortar_lote(videos, args.inicio, args.duracion, args.salida, args.workers,
+                                 args.forzar, args.ffmpeg):
+        estados[resumen["estado"]] += 1
+        if resumen["estado"] == "ok":
+            print(f"✅ {resumen['salida']} ({resumen['bytes'] / 1e6:.1f} MB) en {resumen['segundos']:.2f} s")
+        elif resumen["estado"] == "al día":
+            print(f"⏭️ {resumen['salida']} ya está al día")
+        else:
+            print(f"⚠️ {resumen['video']}: {resumen['error']}")
+    print(f"\n📊 {estados['ok']} recortados, {estados['al día']} al día, {estados['error']} con error "
+          f"en {time.perf_counter() - inicio:.2f} s")
+    sys.exit(1 if estados["error"] else 0)
+
+
+if __name__ == "__main__":
+    main()
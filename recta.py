@@ -1,7 +1,8 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import streamlit as st
 
+from figuras import FiguraSesion, figura_sesion
+
 st.set_page_config(page_title="Línea interactiva", page_icon="📐", layout="centered")
 st.title("📐 Línea recta interactiva")
 
@@ -24,13 +25,25 @@ st.markdown(
     """
 )
 
-# Graficar
-fig, ax = plt.subplots(figsize=(6, 4))
-ax.plot(x, y, label=f"y = {m:.2f}x + {b:.2f}", color="blue")
-ax.axhline(0, color="black", linewidth=0.8)
-ax.axvline(0, color="black", linewidth=0.8)
-ax.grid(True, alpha=0.3)
-ax.set_xlabel("x")
-ax.set_ylabel("y")
-ax.legend()
-st.pyplot(fig)
+# Graficar: la figura se crea una vez por sesión y solo se actualiza la recta
+def nueva_figura():
+    figura = FiguraSesion(figsize=(6, 4))
+    ax = figura.ax
+    figura.linea("recta", color="blue")
+    ax.axhline(0, color="black", linewidth=0.8)
+    ax.axvline(0, color="black", linewidth=0.8)
+    ax.grid(True, alpha=0.3)
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+    return figura
+
+
+figura = figura_sesion("figura_recta", nueva_figura)
+with figura.lock:
+    recta = figura.lineas["recta"]
+    recta.set_data(x, y)
+    recta.set_label(f"y = {m:.2f}x + {b:.2f}")
+    figura.ajustar_limites()
+    figura.ax.legend()
+    png = figura.png()
+st.image(png)
@@ -1,7 +1,10 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import streamlit as st
 
+from decimacion import METODOS
+from figuras import FiguraSesion, figura_sesion
+from osciloscopio import Osciloscopio
+
 st.set_page_config(page_title="Seno interactivo", page_icon="📈", layout="centered")
 st.title("📈 Seno interactivo: amplitud, frecuencia y desplazamiento en tiempo")
 
@@ -14,10 +17,36 @@ with st.sidebar:
     dur = st.slider("Duración mostrada (s)", 0.1, 10.0, 2.0, 0.1)
     fs = st.slider("Frecuencia de muestreo (Hz)", 50, 5000, 1000, 50)
     show_points = st.checkbox("Mostrar puntos de muestreo", value=False)
+    metodo = st.selectbox("Decimación al ancho de la figura", [*METODOS, "ninguna"],
+                          help="Con min/max o LTTB se dibujan ~2 puntos por píxel sin perder picos")
+    vivo = st.toggle("Modo osciloscopio (en vivo)", value=False,
+                     help="El tiempo avanza solo; cada cuadro genera únicamente las muestras nuevas")
+    fps = st.slider("Cuadros por segundo", 1, 30, 15, disabled=not vivo)
+
+
+# La señal solo se recalcula si cambian sus parámetros; mover otros controles
+# (puntos, decimación) solo rehace la gráfica
+@st.cache_data(max_entries=32)
+def senal(A, f, tau, dc, dur, fs):
+    t = np.arange(0, dur, 1.0 / fs)
+    y = A * np.sin(2 * np.pi * f * (t - tau)) + dc
+    return t, y
+
+
+@st.cache_data(max_entries=32)
+def senal_decimada(A, f, tau, dc, dur, fs, pixeles, metodo):
+    """
+    Retorna: (t, y, n_total) con t, y decimados al ancho y n_total el número
+    de muestras originales.
+    """
+    t, y = senal(A, f, tau, dc, dur, fs)
+    n_total = len(t)
+    if metodo not in METODOS:
+        return t, y, n_total
+    return (*METODOS[metodo](t, y, pixeles), n_total)
+
 
 T = 1.0 / f
-t = np.arange(0, dur, 1.0 / fs)
-y = A * np.sin(2 * np.pi * f * (t - tau)) + dc
 
 st.markdown(
     f"""
@@ -27,14 +56,75 @@ st.markdown(
 """
 )
 
-fig = plt.figure(figsize=(8, 4))
-plt.plot(t, y, label="y(t)")
-if show_points:
-    plt.plot(t, y, marker="o", linestyle="None", markersize=2, alpha=0.6, label="muestras")
-plt.axhline(0, linewidth=1)
-plt.grid(True, which="both", alpha=0.3)
-plt.xlabel("Tiempo (s)")
-plt.ylabel("Amplitud")
-plt.title("Señal seno con desfase temporal")
-plt.legend(loc="upper right")
-st.pyplot(fig)
+
+def nueva_figura():
+    figura = FiguraSesion(figsize=(8, 4))
+    ax = figura.ax
+    figura.linea("señal", label="y(t)")
+    figura.linea("muestras", marker="o", linestyle="None", markersize=2, alpha=0.6, label="muestras")
+    ax.axhline(0, linewidth=1)
+    ax.grid(True, which="both", alpha=0.3)
+    ax.set_xlabel("Tiempo (s)")
+    ax.set_ylabel("Amplitud")
+    ax.set_title("Señal seno con desfase temporal")
+    return figura
+
+
+def dibujar(figura, t, y, muestras_t, muestras_y):
+    # Solo la línea va decimada; los puntos son siempre las muestras reales
+    figura.lineas["señal"].set_data(t, y)
+    muestras = figura.lineas["muestras"]
+    if show_points:
+        muestras.set_data(muestras_t, muestras_y)
+    muestras.set_visible(show_points)
+    figura.ax.legend(handles=[l for l in figura.lineas.values() if l.get_visible()], loc="upper right")
+
+
+def aviso_puntos(n_total, pixeles):
+    if show_points and n_total > 2 * pixeles:
+        st.warning(f"{n_total:,} puntos de muestreo en {pixeles} px: se superponen y no se distinguen; "
+                   "baja la frecuencia de muestreo o la duración para verlos.")
+
+
+# Modo en vivo: solo este fragmento se vuelve a ejecutar en cada cuadro. Los
+# parámetros que captura cambian con un rerun completo (al mover un control) y
+# se aplican desde el bloque siguiente; solo fs o la duración rehacen el buffer.
+@st.fragment(run_every=1.0 / fps if vivo else None)
+def osciloscopio():
+    osc = st.session_state.get("osciloscopio")
+    if osc is None or osc.fs != fs or osc.dur != dur:
+        osc = st.session_state["osciloscopio"] = Osciloscopio(fs, dur)
+    figura = figura_sesion("figura_osciloscopio", nueva_figura)
+    with figura.lock:
+        nuevas = osc.avanzar(A, f, tau, dc)
+        pixeles = int(figura.ax.get_window_extent().width)
+        t_real, y_real = osc.tiempos, osc.ventana()
+        t, y = METODOS[metodo](t_real, y_real, pixeles) if metodo in METODOS else (t_real, y_real)
+        dibujar(figura, t, y, t_real, y_real)
+        # Escala fija como en un osciloscopio: la traza no salta entre cuadros
+        margen = max(A, 0.1) * 1.2
+        figura.ax.set_xlim(-dur, 0)
+        figura.ax.set_ylim(dc - margen, dc + margen)
+        png = figura.png()
+    st.image(png)
+    st.caption(f"{osc.muestras:,} muestras generadas · {nuevas:,} nuevas en este cuadro · objetivo {fps} fps")
+    aviso_puntos(len(t_real), pixeles)
+
+
+if vivo:
+    osciloscopio()
+else:
+    figura = figura_sesion("figura_seno", nueva_figura)
+    with figura.lock:
+        # Ancho en píxeles del área de ejes, a la resolución con la que se dibuja
+        pixeles = int(figura.ax.get_window_extent().width)
+        t, y, n_total = senal_decimada(A, f, tau, dc, dur, fs, pixeles, metodo)
+        # Las muestras reales solo hacen falta si se muestran los puntos
+        muestras = senal(A, f, tau, dc, dur, fs) if show_points else (None, None)
+        dibujar(figura, t, y, *muestras)
+        figura.ajustar_limites()
+        png = figura.png()
+    st.image(png)
+    if len(t) < n_total:
+        st.caption(f"Se dibujan {len(t):,} de {n_total:,} muestras ({metodo}, {pixeles} px de ancho)")
+    aviso_puntos(n_total, pixeles)
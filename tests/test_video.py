@@ -0,0 +1,118 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+video = pytest.importorskip("video")
+
+
+@pytest.fixture
+def llamadas(monkeypatch):
+    registro = []
+
+    def falso(url, nombre_salida, **kwargs):
+        registro.append((url, kwargs))
+        return "android", None
+
+    monkeypatch.setattr(video, "descargar_solo_video", falso)
+    return registro
+
+
+def test_lote_sin_rango_no_pasa_inicio(llamadas):
+    resumenes = list(video.descargar_lote(["u1", "u2"], workers=2, memoria=None))
+    assert [r["estado"] for r in resumenes] == ["ok", "ok"]
+    assert sorted(url for url, _ in llamadas) == ["u1", "u2"]
+    for _, kwargs in llamadas:
+        assert kwargs["inicio"] is None
+        assert kwargs["fin"] is None
+
+
+def test_lote_pasa_el_rango(llamadas):
+    list(video.descargar_lote(["u1"], workers=1, memoria=None, inicio=30, fin=35))
+    (_, kwargs), = llamadas
+    assert (kwargs["inicio"], kwargs["fin"]) == (30, 35)
+
+
+def test_rango_secciones_vacio_sin_limites():
+    assert video.rango_secciones(None, None) == {}
+
+
+def test_carrera_empate_gana_el_primero_de_la_lista(monkeypatch):
+    # Que wait() vea a todos los clientes terminados a la vez
+    real = video.wait
+
+    def esperar_todos(futuros, return_when):
+        real(futuros)
+        return real(futuros, return_when=return_when)
+
+    monkeypatch.setattr(video, "wait", esperar_todos)
+    client, info = video.carrera_clientes(
+        "u", ["ios", "android", "web"], "salida", extraer=lambda url, client, outtmpl, extra: {"c": client},
+        log=lambda _: None,
+    )
+    assert (client, info) == ("ios", {"c": "ios"})
+
+
+def test_carrera_sigue_tras_un_cliente_que_falla():
+    fallo = threading.Event()
+    avisos = []
+
+    def extraer(url, client, outtmpl, extra):
+        if client == "android":
+            fallo.set()
+            raise RuntimeError("sin formatos")
+        fallo.wait(5)
+        return {"c": client}
+
+    client, _ = video.carrera_clientes("u", ["android", "ios"], "salida", extraer=extraer, log=avisos.append)
+    assert client == "ios"
+    assert any("android" in aviso for aviso in avisos)
+
+
+def test_carrera_sin_formatos():
+    def extraer(url, client, outtmpl, extra):
+        raise RuntimeError(f"falla {client}")
+
+    with pytest.raises(RuntimeError, match="Ningún cliente"):
+        video.carrera_clientes("u", ["android", "ios"], "salida", extraer=extraer, log=lambda _: None)
+
+
+def test_carrera_propaga_ya_descargado():
+    listo = threading.Event()
+
+    def extraer(url, client, outtmpl, extra):
+        if client == "android":
+            raise video.YaDescargado(url)
+        listo.wait(5)
+        return {"c": client}
+
+    try:
+        with pytest.raises(video.YaDescargado):
+            video.carrera_clientes("u", ["android", "ios"], "salida", extraer=extraer, log=lambda _: None)
+    finally:
+        listo.set()
+
+
+def test_memoria_por_host(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "cache" / "clientes.json")
+    clients = ["android", "ios", "web"]
+    assert video.orden_clientes("https://www.youtube.com/watch?v=1", clients, ruta) == clients
+
+    video.recordar_cliente("https://www.youtube.com/watch?v=1", "web", ruta)
+    assert video.orden_clientes("https://youtube.com/watch?v=2", clients, ruta) == ["web", "android", "ios"]
+    assert video.orden_clientes("https://vimeo.com/1", clients, ruta) == clients
+    assert video.orden_clientes("https://youtube.com/watch?v=2", clients, None) == clients
+
+    # Vencida la memoria se vuelve al orden dado
+    ahora = video.time.time()
+    monkeypatch.setattr(video.time, "time", lambda: ahora + video.VIGENCIA_MEMORIA + 1)
+    assert video.orden_clientes("https://youtube.com/watch?v=2", clients, ruta) == clients
+
+
+def test_memoria_danada(tmp_path):
+    ruta = tmp_path / "clientes.json"
+    ruta.write_text("{no es json", encoding="utf-8")
+    assert video.orden_clientes("https://youtube.com/x", ["android", "ios"], str(ruta)) == ["android", "ios"]
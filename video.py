@@ -1,17 +1,35 @@
+import argparse
+import json
+import os
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from urllib.parse import urlparse
 from yt_dlp import YoutubeDL
+from yt_dlp.utils import download_range_func, parse_duration
 
 CLIENTS = ["android", "ios", "web"]  # evitamos 'tv' que dispara SABR
 
-def intentar_cliente(url, client, outtmpl):
+# Formatos: mejor video (mp4), luego cualquier mejor video
+FORMATO = "bv*[ext=mp4]/bv"
+
+# Registro del último cliente que funcionó en cada host; se prueba primero
+MEMORIA_CLIENTES = os.path.join(os.path.expanduser("~"), ".cache", "video_clientes.json")
+VIGENCIA_MEMORIA = 7 * 24 * 3600  # segundos; después se vuelve al orden de CLIENTS
+_memoria_lock = threading.Lock()
+
+
+class YaDescargado(Exception):
     """
-    Intenta extraer y bajar SOLO VIDEO con el cliente dado.
-    Prioriza MP4; si no hay, toma WebM. No mezcla audio.
+    yt-dlp omitió el video porque ya está en el archivo de descargas.
     """
-    # Formatos: mejor video (mp4), luego cualquier mejor video
-    fmt = "bv*[ext=mp4]/bv"
+
+
+def opciones_cliente(client, outtmpl, extra=None):
     ydl_opts = {
-        "format": fmt,
+        "format": FORMATO,
         "outtmpl": outtmpl,
         "noprogress": False,
         "quiet": False,
@@ -25,40 +43,286 @@ def intentar_cliente(url, client, outtmpl):
         # "cookiesfrombrowser": ("edge",),
         # "cookiesfrombrowser": ("chrome",),
     }
+    ydl_opts.update(extra or {})
+    return ydl_opts
+
+def intentar_cliente(url, client, outtmpl, extra=None):
+    """
+    Intenta extraer y bajar SOLO VIDEO con el cliente dado.
+    Prioriza MP4; si no hay, toma WebM. No mezcla audio.
+    """
+    with YoutubeDL(opciones_cliente(client, outtmpl, extra)) as ydl:
+        info = ydl.extract_info(url, download=True)
+        # Con download_archive yt-dlp devuelve los metadatos sin descargar
+        if info is None or (not info.get("requested_downloads") and ydl.in_download_archive(info)):
+            raise YaDescargado(url)
+    return info
+
+def extraer_formato(url, client, outtmpl, extra=None):
+    """
+    Solo metadatos (download=False) con el cliente dado. yt-dlp ya elige el
+    formato; si ninguno cumple FORMATO lanza error.
+    """
+    ydl_opts = opciones_cliente(client, outtmpl, extra)
+    ydl_opts.update({"quiet": True, "no_warnings": True})
     with YoutubeDL(ydl_opts) as ydl:
-        return ydl.extract_info(url, download=True)
+        info = ydl.extract_info(url, download=False)
+        if info is None or (not info.get("format_id") and ydl.in_download_archive(info)):
+            raise YaDescargado(url)
+    if not isinstance(info, dict) or not info.get("format_id"):
+        raise RuntimeError("sin formato de video utilizable")
+    return info
+
+def descargar_info(info, client, outtmpl, extra=None):
+    """
+    Descarga a partir de metadatos ya extraídos, sin repetir la extracción.
+    """
+    with YoutubeDL(opciones_cliente(client, outtmpl, extra)) as ydl:
+        return ydl.process_ie_result(info, download=True)
+
+def carrera_clientes(url, clients, outtmpl, extraer=extraer_formato, extra=None, log=print):
+    """
+    Extrae metadatos con todos los clientes a la vez y devuelve (client, info)
+    del primero que encuentra un formato. Si varios terminan juntos, gana el
+    que va antes en `clients`.
+    """
+    pool = ThreadPoolExecutor(max_workers=len(clients))
+    futuros = {pool.submit(extraer, url, client, outtmpl, extra): client for client in clients}
+    ultimo_error = None
+    try:
+        pendientes = set(futuros)
+        while pendientes:
+            listos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in sorted(listos, key=lambda f: clients.index(futuros[f])):
+                client = futuros[futuro]
+                try:
+                    return client, futuro.result()
+                except YaDescargado:
+                    raise
+                except Exception as e:
+                    ultimo_error = e
+                    log(f"⚠️ Falló con client '{client}': {e}")
+    finally:
+        # Las extracciones perdedoras no se pueden interrumpir: terminan solas en segundo plano
+        pool.shutdown(wait=False, cancel_futures=True)
+    raise RuntimeError(f"Ningún cliente devolvió un formato de video. Último error: {ultimo_error}")
+
+def rango_secciones(inicio=None, fin=None):
+    """
+    Opciones de yt-dlp para bajar solo el tramo [inicio, fin] (segundos).
+    yt-dlp pasa la URL del formato a ffmpeg con -ss/-t, que pide por rangos
+    HTTP (o solo los fragmentos HLS/DASH) lo necesario para ese tramo y
+    escribe el archivo ya recortado, en copia de stream como recortar.py.
+    """
+    if inicio is None and fin is None:
+        return {}
+    return {
+        "download_ranges": download_range_func(None, [(inicio or 0, float("inf") if fin is None else fin)]),
+        # Corte en el keyframe más cercano, sin recodificar
+        "force_keyframes_at_cuts": False,
+    }
+
+def _host(url):
+    return (urlparse(url).hostname or "").removeprefix("www.")
+
+def cargar_memoria(ruta=MEMORIA_CLIENTES):
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def recordar_cliente(url, client, ruta=MEMORIA_CLIENTES):
+    # El lock evita que dos hilos del modo lote pisen sus cambios
+    with _memoria_lock:
+        memoria = cargar_memoria(ruta)
+        memoria[_host(url)] = {"cliente": client, "fecha": time.time()}
+        carpeta = os.path.dirname(ruta) or "."
+        os.makedirs(carpeta, exist_ok=True)
+        # Escritura atómica: otro proceso nunca lee un JSON a medias
+        fd, temporal = tempfile.mkstemp(dir=carpeta, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(memoria, f)
+        os.replace(temporal, ruta)
+
+def orden_clientes(url, clients=CLIENTS, ruta=MEMORIA_CLIENTES):
+    """
+    `clients` con el último cliente que funcionó para el host al principio.
+    """
+    if ruta is None:
+        return list(clients)
+    registro = cargar_memoria(ruta).get(_host(url), {})
+    previo = registro.get("cliente")
+    if previo in clients and time.time() - registro.get("fecha", 0) < VIGENCIA_MEMORIA:
+        return [previo] + [c for c in clients if c != previo]
+    return list(clients)
+
+def _ruta_descargada(info):
+    # Ruta final si está disponible
+    filepath = None
+    if isinstance(info, dict):
+        filepath = info.get("_filename")
+        if not filepath and "requested_downloads" in info and info["requested_downloads"]:
+            filepath = info["requested_downloads"][0].get("filepath")
+    return filepath
+
+def descargar_solo_video(url, nombre_salida="%(title)s [%(id)s].%(ext)s", carrera=False,
+                         memoria=MEMORIA_CLIENTES, clients=CLIENTS, extra=None, log=print,
+                         inicio=None, fin=None):
+    """
+    Descarga solo video probando los clientes en orden (o en carrera) y
+    devuelve (client, ruta del archivo). memoria=None desactiva el registro
+    por host; `extra` son opciones adicionales de yt-dlp. Con inicio/fin
+    (segundos) baja solo ese tramo (requiere ffmpeg).
+    """
+    extra = {**(extra or {}), **rango_secciones(inicio, fin)}
+    clients = orden_clientes(url, clients, memoria)
+    if carrera:
+        log(f"\n🏁 Carrera de clientes: {', '.join(clients)}")
+        client, info = carrera_clientes(url, clients, nombre_salida, extra=extra, log=log)
+        log(f"🧩 Ganó client: {client}")
+        filepath = _ruta_descargada(descargar_info(info, client, nombre_salida, extra))
+        if memoria is not None:
+            recordar_cliente(url, client, memoria)
+        log(f"✅ Descargado con client '{client}': {filepath or '(ruta no detectada)'}")
+        return client, filepath
 
-def descargar_solo_video(url, nombre_salida="%(title)s [%(id)s].%(ext)s"):
     ultimo_error = None
-    for client in CLIENTS:
+    for client in clients:
         try:
-            print(f"\n🧩 Probando client: {client}")
-            info = intentar_cliente(url, client, nombre_salida)
-            # Ruta final si está disponible
-            filepath = None
-            if isinstance(info, dict):
-                filepath = info.get("_filename")
-                if not filepath and "requested_downloads" in info and info["requested_downloads"]:
-                    filepath = info["requested_downloads"][0].get("filepath")
-            print(f"✅ Descargado con client '{client}': {filepath or '(ruta no detectada)'}")
-            return
+            log(f"\n🧩 Probando client: {client}")
+            info = intentar_cliente(url, client, nombre_salida, extra)
+            filepath = _ruta_descargada(info)
+            if memoria is not None:
+                recordar_cliente(url, client, memoria)
+            log(f"✅ Descargado con client '{client}': {filepath or '(ruta no detectada)'}")
+            return client, filepath
+        except YaDescargado:
+            raise
         except Exception as e:
             ultimo_error = e
-            print(f"⚠️ Falló con client '{client}': {e}")
+            log(f"⚠️ Falló con client '{client}': {e}")
     # Si ninguno funcionó:
     raise RuntimeError(f"No fue posible descargar solo video. Último error: {ultimo_error}")
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Uso: python solo_video.py <URL_de_YouTube> [nombre_salida]")
-        print('Ejemplo: python solo_video.py https://youtu.be/TuweVOWf-SU "solo_video_%(height)sp.%(ext)s"')
-        sys.exit(1)
+def leer_urls(ruta):
+    """
+    URLs de un archivo de texto, una por línea; ignora vacías y comentarios (#).
+    """
+    with open(ruta, encoding="utf-8") as f:
+        return [linea.strip() for linea in f if linea.strip() and not linea.lstrip().startswith("#")]
 
-    url = sys.argv[1]
-    nombre_salida = sys.argv[2] if len(sys.argv) >= 3 else "%(title)s [%(id)s].%(ext)s"
+def _descargar_item(url, nombre_salida, carrera, memoria, extra, inicio, fin):
+    reloj = time.perf_counter()
+    resumen = {"url": url, "estado": "ok", "cliente": None, "ruta": None, "bytes": 0, "segundos": 0.0}
+    try:
+        client, filepath = descargar_solo_video(url, nombre_salida, carrera=carrera, memoria=memoria,
+                                                extra=extra, log=lambda *_: None, inicio=inicio, fin=fin)
+        resumen.update(cliente=client, ruta=filepath)
+        if filepath and os.path.exists(filepath):
+            resumen["bytes"] = os.path.getsize(filepath)
+    except YaDescargado:
+        resumen["estado"] = "omitido"
+    except Exception as e:
+        resumen.update(estado="error", error=str(e))
+    resumen["segundos"] = time.perf_counter() - reloj
+    return resumen
+
+def descargar_lote(urls, nombre_salida="%(title)s [%(id)s].%(ext)s", workers=4, fragmentos=4,
+                   archivo_descargas="descargados.txt", carrera=False, memoria=MEMORIA_CLIENTES,
+                   inicio=None, fin=None):
+    """
+    Descarga varias URLs con un pool de `workers` hilos y genera un resumen
+    por video a medida que terminan. Cada video baja `fragmentos` fragmentos
+    a la vez (HLS/DASH); los IDs completos quedan en `archivo_descargas` y se
+    omiten en la próxima corrida, y los .part se reanudan.
+    """
+    extra = {
+        "download_archive": archivo_descargas,
+        "concurrent_fragment_downloads": fragmentos,
+        "continuedl": True,
+        "nopart": False,
+        "quiet": True,
+        "noprogress": True,
+    }
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futuros = [pool.submit(_descargar_item, url, nombre_salida, carrera, memoria, extra, inicio, fin)
+                   for url in urls]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+
+def main_lote(args):
+    urls = leer_urls(args.lista)
+    print(f"📋 {len(urls)} URLs, {args.workers} descargas a la vez, {args.fragmentos} fragmentos por video")
+    inicio = time.perf_counter()
+    total_bytes = 0
+    estados = {"ok": 0, "omitido": 0, "error": 0}
+    for resumen in descargar_lote(urls, args.nombre_salida, workers=args.workers, fragmentos=args.fragmentos,
+                                  archivo_descargas=args.archivo_descargas, carrera=args.carrera,
+                                  memoria=None if args.sin_memoria else MEMORIA_CLIENTES,
+                                  inicio=args.desde, fin=args.hasta):
+        estados[resumen["estado"]] += 1
+        total_bytes += resumen["bytes"]
+        if resumen["estado"] == "ok":
+            print(f"✅ {resumen['url']}: {resumen['bytes'] / 1e6:.1f} MB en {resumen['segundos']:.1f} s "
+                  f"(client {resumen['cliente']}) -> {resumen['ruta']}")
+        elif resumen["estado"] == "omitido":
+            print(f"⏭️ {resumen['url']}: ya descargado")
+        else:
+            print(f"⚠️ {resumen['url']}: {resumen['error']}")
+    segundos = time.perf_counter() - inicio
+    print(f"\n📊 {estados['ok']} descargados, {estados['omitido']} omitidos, {estados['error']} con error; "
+          f"{total_bytes / 1e6:.1f} MB en {segundos:.1f} s ({total_bytes / 1e6 / max(segundos, 1e-9):.2f} MB/s)")
+    return 1 if estados["error"] else 0
+
+def _segundos(texto):
+    segundos = parse_duration(texto)
+    if segundos is None:
+        raise argparse.ArgumentTypeError(f"tiempo inválido: {texto!r}")
+    return segundos
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Descarga solo el video (sin audio) de una URL",
+        epilog='Ejemplo: python video.py https://youtu.be/TuweVOWf-SU "solo_video_%%(height)sp.%%(ext)s"',
+    )
+    parser.add_argument("url", nargs="?", help="URL del video (o --lista)")
+    parser.add_argument("nombre_salida", nargs="?", default="%(title)s [%(id)s].%(ext)s",
+                        help="Plantilla de nombre de yt-dlp")
+    parser.add_argument("--carrera", action="store_true",
+                        help="Extrae con todos los clientes a la vez y descarga con el primero que responde")
+    parser.add_argument("--sin-memoria", action="store_true",
+                        help="No leer ni guardar el último cliente que funcionó por host")
+    parser.add_argument("--desde", type=_segundos, help="Bajar solo desde este tiempo (s o hh:mm:ss)")
+    parser.add_argument("--hasta", type=_segundos,
+                        help="Bajar solo hasta este tiempo; --hasta 5 evita descargar todo y recortar después")
+    lote = parser.add_argument_group("modo lote")
+    lote.add_argument("--lista", help="Archivo de texto con una URL por línea")
+    lote.add_argument("--workers", type=int, default=4, help="Videos descargándose a la vez")
+    lote.add_argument("--fragmentos", type=int, default=4, help="Fragmentos simultáneos por video (HLS/DASH)")
+    lote.add_argument("--archivo-descargas", default="descargados.txt",
+                      help="Registro de IDs completos; se omiten en la próxima corrida")
+    args = parser.parse_args(argv)
+    if not args.url and not args.lista:
+        parser.error("indica una URL o --lista")
+    if args.lista and args.url:
+        # Con --lista el único posicional es la plantilla de nombre
+        if args.nombre_salida != parser.get_default("nombre_salida"):
+            parser.error("con --lista no se indica URL")
+        args.nombre_salida, args.url = args.url, None
+    if args.desde is not None and args.hasta is not None and args.hasta <= args.desde:
+        parser.error("--hasta debe ser mayor que --desde")
+    return args
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.lista:
+        sys.exit(main_lote(args))
 
     try:
-        descargar_solo_video(url, nombre_salida)
+        descargar_solo_video(args.url, args.nombre_salida, carrera=args.carrera,
+                             memoria=None if args.sin_memoria else MEMORIA_CLIENTES,
+                             inicio=args.desde, fin=args.hasta)
     except Exception as e:
         print("\n❌ Error definitivo:", e)
         print("\nSugerencias rápidas:")